@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the country puzzle engine.
+Simulated players with scripted guess strategies play QuizSessions
+against catalogs from the real handful of countries up to synthetic ones
+of 10k entries. For every size the suite reports data loading times,
+rounds/sec, latency percentiles per operation and memory per session.
+Think times advance a fake clock, so the engine is measured flat out while
+scoring still sees realistic answer times. --server additionally runs the
+players as concurrent TCP clients of an in-process quiz server.
+
+    python benchmark_quiz.py --sizes 7,1000,10000 --rounds 20000 --json-out bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from country_catalog import CountryCatalog, build
+from localization import Localization
+from percentiles import percentile
+from quiz_engine import QuizSession
+from quiz_server import QuizServer
+
+STRATEGIES = ("perfect", "random", "worst")
+
+def latency_summary(samples_ns):
+    return {
+        "count": len(samples_ns),
+        "p50_us": percentile(samples_ns, 0.50) / 1000,
+        "p95_us": percentile(samples_ns, 0.95) / 1000,
+        "p99_us": percentile(samples_ns, 0.99) / 1000,
+        "max_us": max(samples_ns, default=0) / 1000,
+    }
+
+# Data
+
+def load_country_data(path="country_data.json"):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def synthetic_countries(size, base):
+    """A country_data.json style dict of size entries built from the real strings."""
+    if size <= len(base):
+        return dict(list(base.items())[:size])
+    templates = list(base.values())
+    countries = {}
+    for i in range(size):
+        template = templates[i % len(templates)]
+        countries[f"country_{i:05d}"] = {
+            "names": {language: f"{name} {i}" for language, name in template["names"].items()},
+            "flag": template["flag"],
+            "hints": {language: [f"{hint} ({i})" for hint in hints] for language, hints in template["hints"].items()},
+            "info": {language: list(lines) for language, lines in template["info"].items()},
+        }
+    return countries
+
+def timed_ms(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def benchmark_loading(countries, directory):
+    """Time the three ways of getting a catalog: parse JSON, compile in memory, map compiled files."""
+    json_path = os.path.join(directory, "countries.json")
+    base = os.path.join(directory, "countries")
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump(countries, file, ensure_ascii=False)
+
+    parsed, json_ms = timed_ms(load_country_data, json_path)
+    _, compile_ms = timed_ms(CountryCatalog.from_dict, parsed)
+    _, build_ms = timed_ms(build, json_path, base)
+    catalog, open_ms = timed_ms(CountryCatalog.open, base)
+    _, language_ms = timed_ms(catalog.language, "en")
+    return catalog, {
+        "json_parse_ms": json_ms,
+        "compile_in_memory_ms": compile_ms,
+        "build_files_ms": build_ms,
+        "open_mapped_ms": open_ms,
+        "first_language_ms": language_ms,
+        "catalog_bytes": sum(os.path.getsize(os.path.join(directory, name))
+                             for name in os.listdir(directory) if name.endswith(".cat")),
+    }
+
+# Simulated players
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def choose_guess(strategy, session, rng):
+    if strategy == "perfect":
+        return session.correct_country
+    if strategy == "worst":
+        wrong = [key for key in session.options if key != session.correct_country]
+        return rng.choice(wrong) if wrong else session.correct_country
+    return rng.choice(session.options)
+
+def benchmark_engine(catalog, rounds, strategy, think_time, seed):
+    """Play rounds back to back; return throughput and per-operation latencies."""
+    rng = random.Random(seed)
+    clock = FakeClock()
+    localization = Localization(catalog)
+    pack = localization.get("en")
+    session = QuizSession(catalog, pack, rng, clock)
+    timings = {"sample": [], "new_round": [], "guess": [], "language_switch": []}
+    languages = catalog.languages
+    counter = time.perf_counter_ns
+
+    start = time.perf_counter()
+    for round_number in range(rounds):
+        if session.game_over:
+            session.reset()
+        if round_number % 100 == 0:
+            t = counter()
+            session.pack = localization.get(languages[(round_number // 100) % len(languages)])
+            timings["language_switch"].append(counter() - t)
+
+        t = counter()
+        options = session.sample()
+        timings["sample"].append(counter() - t)
+        t = counter()
+        session.new_round(options)
+        timings["new_round"].append(counter() - t)
+
+        while session.round_active:
+            clock.advance(rng.uniform(*think_time))
+            guess = choose_guess(strategy, session, rng)
+            t = counter()
+            session.guess(guess)
+            timings["guess"].append(counter() - t)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "strategy": strategy,
+        "rounds": rounds,
+        "rounds_per_sec": rounds / elapsed,
+        "guesses": len(timings["guess"]),
+        "latency": {name: latency_summary(samples) for name, samples in timings.items()},
+    }
+
+def benchmark_memory(catalog, sessions, seed):
+    """Average traced bytes per live session that has started a round."""
+    localization = Localization(catalog)
+    pack = localization.get("en")
+    rng = random.Random(seed)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    live = []
+    for _ in range(sessions):
+        session = QuizSession(catalog, pack, rng)
+        session.new_round()
+        live.append(session)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {"sessions": sessions, "bytes_per_session": allocated / sessions}
+
+# Load test over TCP
+
+async def tcp_player(port, games, think_time, rng, timings):
+    """Play games with random guesses; TCP players cannot see the answer."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def request(op, message):
+        t = time.perf_counter_ns()
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        timings[op].append(time.perf_counter_ns() - t)
+        return reply
+
+    rounds = 0
+    reply = await request("start", {"op": "start", "language": rng.choice(("en", "hi", "gu"))})
+    for _ in range(games):
+        while reply["type"] != "game_over":
+            options = [option["country"] for option in reply["options"]]
+            while reply["type"] in ("round", "hint"):
+                await asyncio.sleep(rng.uniform(*think_time))
+                reply = await request("guess", {"op": "guess", "country": rng.choice(options)})
+            rounds += 1
+            if reply["type"] == "result":
+                reply = json.loads(await reader.readline())  # Next round, pushed by the server timer
+        reply = await request("start", {"op": "start"})
+    writer.write(b'{"op": "quit"}\n')
+    await writer.drain()
+    writer.close()
+    return rounds
+
+async def benchmark_server(catalog, players, games, think_time, round_delay, seed):
+    server = await QuizServer(catalog, round_delay, seed).start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    rng = random.Random(seed)
+    timings = {"start": [], "guess": []}
+    start = time.perf_counter()
+    rounds = await asyncio.gather(*(tcp_player(port, games, think_time, random.Random(rng.random()), timings)
+                                    for _ in range(players)))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+    return {
+        "players": players,
+        "strategy": "random",
+        "rounds": sum(rounds),
+        "rounds_per_sec": sum(rounds) / elapsed,
+        "latency": {name: latency_summary(samples) for name, samples in timings.items()},
+    }
+
+# Reporting
+
+def print_report(results):
+    for result in results:
+        print(f"\n== {result['countries']} countries ==")
+        loading = result["loading"]
+        print(f"  load: json {loading['json_parse_ms']:.2f} ms, compile {loading['compile_in_memory_ms']:.2f} ms, "
+              f"build {loading['build_files_ms']:.2f} ms, open {loading['open_mapped_ms']:.2f} ms, "
+              f"first language {loading['first_language_ms']:.2f} ms, {loading['catalog_bytes']} bytes on disk")
+        print(f"  memory: {result['memory']['bytes_per_session']:.0f} bytes/session "
+              f"over {result['memory']['sessions']} sessions")
+        for run in result["engine"] + result.get("server", []):
+            label = f"tcp x{run['players']}" if "players" in run else "engine"
+            print(f"  {label:<10} {run['strategy']:<8} {run['rounds_per_sec']:>12.0f} rounds/s")
+            for op, stats in run["latency"].items():
+                print(f"    {op:<16} p50 {stats['p50_us']:8.2f}  p95 {stats['p95_us']:8.2f}  "
+                      f"p99 {stats['p99_us']:8.2f}  max {stats['max_us']:8.2f} us")
+
+def parse_range(text):
+    low, _, high = text.partition(",")
+    return float(low), float(high or low)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the country puzzle engine with simulated players")
+    parser.add_argument("--sizes", default="7,100,1000,10000", help="comma-separated catalog sizes")
+    parser.add_argument("--rounds", type=int, default=20000, help="engine rounds per strategy and size")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--think-time", type=parse_range, default=(0.5, 8.0),
+                        help="simulated seconds per guess, as min,max")
+    parser.add_argument("--sessions", type=int, default=2000, help="live sessions for the memory measurement")
+    parser.add_argument("--server", action="store_true", help="also load-test the TCP server")
+    parser.add_argument("--players", type=int, default=200, help="concurrent TCP players with --server")
+    parser.add_argument("--games", type=int, default=2, help="games per TCP player with --server")
+    parser.add_argument("--server-think-time", type=parse_range, default=(0.0, 0.01),
+                        help="real seconds per guess for TCP players, as min,max")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json-out", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    base = load_country_data()
+    strategies = args.strategies.split(",")
+    results = []
+    for size in (int(size) for size in args.sizes.split(",")):
+        countries = synthetic_countries(size, base)
+        with tempfile.TemporaryDirectory() as directory:
+            catalog, loading = benchmark_loading(countries, directory)
+            result = {
+                "countries": len(catalog),
+                "loading": loading,
+                "memory": benchmark_memory(catalog, args.sessions, args.seed),
+                "engine": [benchmark_engine(catalog, args.rounds, strategy, args.think_time, args.seed)
+                           for strategy in strategies],
+            }
+            if args.server:
+                result["server"] = [asyncio.run(benchmark_server(catalog, args.players, args.games,
+                                                                 args.server_think_time, 0, args.seed))]
+            results.append(result)
+
+    print_report(results)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
-import pygame
+import os
 import sys
 import math
 import random
+import argparse
+import numpy as np
+
+# Headless mode runs the simulation without a visible window (soak tests, balancing)
+HEADLESS = "--headless" in sys.argv or os.environ.get("BOOMERANG_HEADLESS") == "1"
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
 from pygame.locals import *
+from text_cache import get_font, render_text
+from frame_profiler import FrameProfiler
+from boomerang_replay import Replay, ReplayRecorder
 
 # Initialize pygame
 pygame.init()
@@ -10,6 +23,8 @@ pygame.init()
 # Constants
 WIDTH, HEIGHT = 800, 600
 FPS = 60
+STEP_MS = 1000 / FPS  # Fixed simulation timestep
+STALL_SECONDS = 60  # Headless games end once a level has lasted this long
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
@@ -20,7 +35,6 @@ YELLOW = (255, 255, 0)
 # Game window
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Boomerang Dodge")
-clock = pygame.time.Clock()
 
 # Load images and scale them
 def load_image(path, scale=1.0):
@@ -35,6 +49,82 @@ def load_image(path, scale=1.0):
         pygame.draw.circle(surf, RED, (25, 25), 25)
         return surf
 
+# Simulation clock advancing by a fixed timestep per tick, as fast as the CPU allows
+class FixedStepClock:
+    def __init__(self, step_ms=STEP_MS):
+        self.step_ms = step_ms
+        self.ticks = 0
+
+    def tick(self, fps=None):
+        self.ticks += self.step_ms
+        return self.step_ms
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+# Fixed-step clock that also paces ticks to real time (scaled by speed) for live play
+class RealtimeClock(FixedStepClock):
+    def __init__(self, step_ms=STEP_MS, speed=1.0):
+        super().__init__(step_ms)
+        self.speed = speed
+        self.clock = pygame.time.Clock()
+
+    def tick(self, fps=FPS):
+        self.clock.tick(fps * self.speed)
+        return super().tick(fps)
+
+# Input controllers return the set of pressed action keys for the current tick
+# (K_r restarts from the game over screen)
+ACTION_KEYS = (K_LEFT, K_RIGHT, K_SPACE, K_r)
+
+def keys_to_bits(keys):
+    return sum(1 << i for i, key in enumerate(ACTION_KEYS) if key in keys)
+
+def bits_to_keys(bits):
+    return frozenset(key for i, key in enumerate(ACTION_KEYS) if bits & (1 << i))
+
+class KeyboardInput:
+    def get_keys(self, game):
+        pressed = pygame.key.get_pressed()
+        return frozenset(key for key in ACTION_KEYS if pressed[key])
+
+class ScriptedInput:
+    def __init__(self, script):
+        # script is a sequence of key sets, one per tick; no keys once exhausted
+        self.script = list(script)
+        self.tick = 0
+
+    def get_keys(self, game):
+        keys = self.script[self.tick] if self.tick < len(self.script) else ()
+        self.tick += 1
+        return frozenset(keys)
+
+class ReplayInput:
+    def __init__(self, replay):
+        self.inputs = replay.inputs()
+
+    def get_keys(self, game):
+        bits = next(self.inputs, None)
+        return frozenset() if bits is None else bits_to_keys(bits)
+
+class DodgeAI:
+    def __init__(self, danger_radius=120):
+        self.danger_radius = danger_radius
+
+    def get_keys(self, game):
+        player = game.player.rect
+        threats = [b for b in game.boomerangs
+                   if pygame.math.Vector2(player.center).distance_to(b.pos) < self.danger_radius]
+        if not threats:
+            return frozenset()
+
+        # Step away from the closest boomerang, jumping over low ones
+        closest = min(threats, key=lambda b: pygame.math.Vector2(player.center).distance_to(b.pos))
+        keys = {K_LEFT if closest.pos.x >= player.centerx else K_RIGHT}
+        if closest.pos.y > player.top:
+            keys.add(K_SPACE)
+        return frozenset(keys)
+
 # Player class
 class Player(pygame.sprite.Sprite):
     def __init__(self):
@@ -43,22 +133,26 @@ class Player(pygame.sprite.Sprite):
         self.image = pygame.Surface((40, 80), pygame.SRCALPHA)
         pygame.draw.rect(self.image, BLUE, (0, 0, 40, 80))
         self.rect = self.image.get_rect(midbottom=(WIDTH // 2, HEIGHT - 20))
+        self.mask = pygame.mask.from_surface(self.image)
         self.speed = 5
         self.is_jumping = False
         self.jump_velocity = 0
         self.gravity = 0.5
 
-    def update(self):
-        keys = pygame.key.get_pressed()
-        
+    def reset(self):
+        self.rect.midbottom = (WIDTH // 2, HEIGHT - 20)
+        self.is_jumping = False
+        self.jump_velocity = 0
+
+    def update(self, keys=frozenset()):
         # Horizontal movement
-        if keys[K_LEFT] and self.rect.left > 0:
+        if K_LEFT in keys and self.rect.left > 0:
             self.rect.x -= self.speed
-        if keys[K_RIGHT] and self.rect.right < WIDTH:
+        if K_RIGHT in keys and self.rect.right < WIDTH:
             self.rect.x += self.speed
             
         # Jumping
-        if keys[K_SPACE] and not self.is_jumping:
+        if K_SPACE in keys and not self.is_jumping:
             self.is_jumping = True
             self.jump_velocity = -12
             
@@ -70,104 +164,365 @@ class Player(pygame.sprite.Sprite):
                 self.rect.bottom = HEIGHT - 20
                 self.is_jumping = False
 
+# Pre-rendered rotations of a source image, one frame per angle step
+class RotationAtlas:
+    def __init__(self, image, step):
+        self.step = step
+        self.frames = []
+        for angle in range(0, 360, step):
+            rotated = pygame.transform.rotate(image, angle)
+            mask = pygame.mask.from_surface(rotated)
+            # Offset of the rotated frame's top-left from the sprite center
+            offset = pygame.Rect(0, 0, rotated.get_width(), rotated.get_height())
+            offset.center = (0, 0)
+            self.frames.append((rotated, mask, offset))
+        # Frame offsets as (left, top, right, bottom) rows for batched culling
+        self.extents = np.array([(o.left, o.top, o.right, o.bottom) for _, _, o in self.frames])
+
+    def frame(self, angle):
+        return self.frames[int(angle) // self.step % len(self.frames)]
+
 # Boomerang class
 class Boomerang(pygame.sprite.Sprite):
-    def __init__(self, start_pos, target_pos):
+    # Shared rotation atlases keyed by (source image key, angle step)
+    atlases = {}
+    base_images = {}
+
+    @classmethod
+    def base_image(cls, key="default"):
+        if key not in cls.base_images:
+            image = pygame.Surface((30, 30), pygame.SRCALPHA)
+            pygame.draw.polygon(image, YELLOW, [(0, 0), (30, 15), (0, 30), (15, 15)])
+            cls.base_images[key] = image
+        return cls.base_images[key]
+
+    @classmethod
+    def build_atlas(cls, key="default", step=10):
+        if (key, step) not in cls.atlases:
+            cls.atlases[(key, step)] = RotationAtlas(cls.base_image(key), step)
+        return cls.atlases[(key, step)]
+
+    def __init__(self, start_pos, target_pos, store, image_key="default", pool=None):
         super().__init__()
-        # Create a placeholder for the boomerang
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.polygon(self.image, YELLOW, [(0, 0), (30, 15), (0, 30), (15, 15)])
+        # Trajectory state lives in the shared projectile store; the sprite is a render view
+        self.store = store
+        self.pool = pool
+        self.atlas = Boomerang.build_atlas(image_key, store.atlas.step)
+        self.original_image = Boomerang.base_image(image_key)
+        self.slot = None
+        if start_pos is not None:
+            self.launch(start_pos, target_pos)
+
+    def launch(self, start_pos, target_pos):
+        self.slot = self.store.allocate(start_pos, target_pos, self)
+        self.image, self.mask, offset = self.atlas.frame(0)
+        self.rect = offset.move(start_pos)
+
+    @property
+    def pos(self):
+        return pygame.math.Vector2(self.store.pos[self.slot].tolist())
+
+    @property
+    def angle(self):
+        return int(self.store.angle[self.slot])
+
+    def kill(self):
+        super().kill()
+        if self.slot is None:
+            return
+        self.store.release(self.slot)
+        self.slot = None
+        # Park the sprite in its pool for the next spawn
+        if self.pool is not None:
+            self.pool.release(self)
+
+# Recycles Boomerang sprites so spawning doesn't allocate new objects every time
+class BoomerangPool:
+    def __init__(self, store, image_key="default", size=0):
+        self.store = store
+        self.image_key = image_key
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        for _ in range(size):
+            self.free.append(self.create())
+
+    def create(self):
+        # New boomerangs start parked: no store slot until launched
+        self.created += 1
+        return Boomerang(None, None, self.store, self.image_key, pool=self)
+
+    def acquire(self, start_pos, target_pos):
+        if self.free:
+            boomerang = self.free.pop()
+            self.reused += 1
+        else:
+            boomerang = self.create()
+        boomerang.launch(start_pos, target_pos)
+        return boomerang
+
+    def release(self, boomerang):
+        self.released += 1
+        self.free.append(boomerang)
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "free": len(self.free),
+            "in_use": self.created - len(self.free),
+        }
+
+# Structure-of-arrays store for boomerang trajectories, stepped in one batch per frame
+class ProjectileStore:
+    def __init__(self, atlas, capacity=64, speed=5, max_distance=300, rotation_speed=10,
+                 return_point=(WIDTH // 2, HEIGHT - 60), bounds=(WIDTH, HEIGHT)):
+        self.atlas = atlas
+        self.speed = speed
+        self.max_distance = max_distance  # Maximum distance before returning
+        self.rotation_speed = rotation_speed
+        self.return_point = np.array(return_point, dtype=float)
+        self.bounds = bounds
+        
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.start = np.zeros((capacity, 2))
+        self.angle = np.zeros(capacity, dtype=np.int64)
+        self.returning = np.zeros(capacity, dtype=bool)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.owners = [None] * capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self.owners) - len(self.free_slots)
+
+    def grow(self):
+        old = len(self.owners)
+        for name in ("pos", "vel", "start", "angle", "returning", "active"):
+            array = getattr(self, name)
+            grown = np.zeros((old * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.owners.extend([None] * old)
+        self.free_slots.extend(range(old * 2 - 1, old - 1, -1))
+
+    def allocate(self, start_pos, target_pos, owner):
+        if not self.free_slots:
+            self.grow()
+        slot = self.free_slots.pop()
         
-        self.rect = self.image.get_rect(center=start_pos)
-        self.pos = pygame.math.Vector2(start_pos)
-        self.vel = pygame.math.Vector2(0, 0)
-        self.acc = pygame.math.Vector2(0, 0)
+        # Initial velocity points at the target
+        direction = pygame.math.Vector2(target_pos) - pygame.math.Vector2(start_pos)
+        direction.normalize_ip()
+        self.vel[slot] = direction * self.speed
+        self.pos[slot] = start_pos
+        self.start[slot] = start_pos
+        self.angle[slot] = 0
+        self.returning[slot] = False
+        self.active[slot] = True
+        self.owners[slot] = owner
+        return slot
+
+    def release(self, slot):
+        self.active[slot] = False
+        self.owners[slot] = None
+        self.free_slots.append(slot)
+
+    def step(self):
+        """Advance every active projectile one frame and sync their sprite views.
+
+        Returns the owners of projectiles that left the screen.
+        """
+        idx = np.flatnonzero(self.active)
+        if not idx.size:
+            return []
         
-        # Calculate direction to target
-        self.direction = pygame.math.Vector2(target_pos) - self.pos
-        self.direction.normalize_ip()
+        # Rotate
+        self.angle[idx] = (self.angle[idx] + self.rotation_speed) % 360
         
-        # Set initial velocity
-        self.speed = 5
-        self.vel = self.direction * self.speed
-        
-        # Boomerang properties
-        self.max_distance = 300  # Maximum distance before returning
-        self.start_pos = pygame.math.Vector2(start_pos)
-        self.returning = False
-        self.angle = 0
-        self.rotation_speed = 10
-        self.original_image = self.image.copy()
-
-    def update(self):
-        # Rotate the boomerang
-        self.angle = (self.angle + self.rotation_speed) % 360
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
-        self.rect = self.image.get_rect(center=self.rect.center)
-        
-        # Move the boomerang
-        if not self.returning and self.pos.distance_to(self.start_pos) > self.max_distance:
-            self.returning = True
-            
-        if self.returning:
-            # Calculate direction back to player
-            direction = pygame.math.Vector2(WIDTH // 2, HEIGHT - 60) - self.pos
-            if direction.length() > 0:
-                direction.normalize_ip()
-                self.vel = direction * self.speed
+        # Start returning once past the maximum distance from the start point
+        offset = self.pos[idx] - self.start[idx]
+        distance = np.sqrt(offset[:, 0] * offset[:, 0] + offset[:, 1] * offset[:, 1])
+        self.returning[idx] |= distance > self.max_distance
+        
+        # Returning projectiles head back to the player's start position
+        back = idx[self.returning[idx]]
+        direction = self.return_point - self.pos[back]
+        length = np.sqrt(direction[:, 0] * direction[:, 0] + direction[:, 1] * direction[:, 1])
+        moving = length > 0
+        back = back[moving]
+        self.vel[back] = direction[moving] / length[moving, None] * self.speed
+        
+        # Move and snap sprite centers to whole pixels
+        self.pos[idx] += self.vel[idx]
+        center = self.pos[idx].astype(np.int64)
         
-        self.pos += self.vel
-        self.rect.center = (int(self.pos.x), int(self.pos.y))
+        # Cull anything whose rotated frame is fully off screen
+        frame = self.angle[idx] // self.atlas.step % len(self.atlas.frames)
+        extents = self.atlas.extents[frame]
+        width, height = self.bounds
+        off_screen = ((center[:, 0] + extents[:, 2] < 0) | (center[:, 0] + extents[:, 0] > width) |
+                      (center[:, 1] + extents[:, 3] < 0) | (center[:, 1] + extents[:, 1] > height))
         
-        # Remove if it goes off screen
-        if self.rect.right < 0 or self.rect.left > WIDTH or self.rect.bottom < 0 or self.rect.top > HEIGHT:
-            self.kill()
+        # Point each sprite view at its pre-rendered frame and new position
+        frames = self.atlas.frames
+        owners = self.owners
+        for slot, frame_index, (cx, cy) in zip(idx.tolist(), frame.tolist(), center.tolist()):
+            view = owners[slot]
+            view.image, view.mask, offset = frames[frame_index]
+            view.rect = offset.move(cx, cy)
+        return [owners[slot] for slot in idx[off_screen].tolist()]
+
+# Sprite group bucketed into a uniform grid for broad-phase collision queries
+class SpatialHashGroup(pygame.sprite.Group):
+    def __init__(self, *sprites, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}         # (cx, cy) -> set of sprites
+        self.sprite_cells = {}  # sprite -> cell keys it currently occupies
+        super().__init__(*sprites)
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, (rect.right - 1) // size, rect.top // size, (rect.bottom - 1) // size)
+
+    def cell_keys(self, cell_range):
+        x0, x1, y0, y1 = cell_range
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def rehash(self, sprite):
+        cell_range = self.cell_range(sprite.rect)
+        if self.sprite_cells.get(sprite, (None,))[0] == cell_range:
+            return
+        self.unhash(sprite)
+        keys = self.cell_keys(cell_range)
+        for key in keys:
+            self.cells.setdefault(key, set()).add(sprite)
+        self.sprite_cells[sprite] = (cell_range, keys)
+
+    def unhash(self, sprite):
+        for key in self.sprite_cells.pop(sprite, (None, ()))[1]:
+            bucket = self.cells[key]
+            bucket.discard(sprite)
+            if not bucket:
+                del self.cells[key]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.rehash(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.unhash(sprite)
+
+    def update(self, *args, **kwargs):
+        # Re-bucket sprites as they move; killed sprites are unhashed by remove_internal
+        for sprite in self.sprites():
+            sprite.update(*args, **kwargs)
+            if sprite in self.sprite_cells:
+                self.rehash(sprite)
+
+    def query(self, rect):
+        found = set()
+        for key in self.cell_keys(self.cell_range(rect)):
+            found.update(self.cells.get(key, ()))
+        return found
+
+    def collide(self, sprite):
+        # Narrow phase: rect overlap first, then the cached per-angle masks
+        return [other for other in self.query(sprite.rect)
+                if sprite.rect.colliderect(other.rect) and pygame.sprite.collide_mask(sprite, other)]
 
 # Game class
 class Game:
-    def __init__(self):
-        self.all_sprites = pygame.sprite.Group()
-        self.boomerangs = pygame.sprite.Group()
+    def __init__(self, clock=None, seed=None, controller=None, headless=HEADLESS, profiler=None, record=False):
+        self.headless = headless
+        self.profiler = profiler or FrameProfiler(enabled=not headless)
+        self.clock = clock or (FixedStepClock() if headless else RealtimeClock())
+        # Every game has a concrete seed so it can be replayed
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.controller = controller or (DodgeAI() if headless else KeyboardInput())
+        self.recorder = ReplayRecorder(self.seed, self.clock.step_ms) if record else None
+        self.steps = 0
+        
+        self.all_sprites = pygame.sprite.RenderUpdates()
+        self.boomerangs = SpatialHashGroup()
         self.player = Player()
         self.all_sprites.add(self.player)
         
+        self.font = get_font(None, 36)
+        self.overlay_font = get_font(None, 22)
+        self.overlay_rect = None
+        
+        # Dirty-rect rendering: the HUD is drawn into the background so clears restore it
+        self.background = pygame.Surface((WIDTH, HEIGHT))
+        self.background.fill(BLACK)
+        self.hud_state = None
+        self.hud_rects = []
+        self.full_redraw = True
+        
+        # Build the shared rotation atlas once, before any boomerang spawns
+        self.projectiles = ProjectileStore(Boomerang.build_atlas())
+        self.boomerang_pool = BoomerangPool(self.projectiles, size=16)
+        
+        self.reset()
+        
+    def reset(self):
+        # Clear all boomerangs
+        for boomerang in self.boomerangs:
+            boomerang.kill()
+        self.player.reset()
+        
         self.level = 1
         self.score = 0
-        self.game_over = False
-        self.font = pygame.font.SysFont(None, 36)
         
         # Level properties
         self.boomerang_count = 1
         self.spawn_timer = 0
         self.spawn_delay = 2000  # milliseconds
         
+        self.hud_state = None
+        self.enter_state("level_intro", 2000)
+        
+    def enter_state(self, state, duration=None):
+        """Switch scene; timed scenes end after duration ms of game clock time."""
+        self.state = state
+        self.state_until = None if duration is None else self.clock.get_ticks() + duration
+        self.full_redraw = True
+        
+    @property
+    def game_over(self):
+        return self.state == "game_over"
+        
     def spawn_boomerangs(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         
         if current_time - self.spawn_timer > self.spawn_delay and len(self.boomerangs) < self.boomerang_count:
             # Spawn from random edge position
-            side = random.choice(['left', 'right', 'top'])
+            side = self.rng.choice(['left', 'right', 'top'])
             
             if side == 'left':
-                pos = (0, random.randint(50, HEIGHT - 100))
+                pos = (0, self.rng.randint(50, HEIGHT - 100))
             elif side == 'right':
-                pos = (WIDTH, random.randint(50, HEIGHT - 100))
+                pos = (WIDTH, self.rng.randint(50, HEIGHT - 100))
             else:  # top
-                pos = (random.randint(50, WIDTH - 50), 0)
+                pos = (self.rng.randint(50, WIDTH - 50), 0)
                 
             # Target is slightly offset from player to create curved path
-            target_pos = (self.player.rect.centerx + random.randint(-100, 100), 
-                          self.player.rect.centery + random.randint(-50, 50))
+            target_pos = (self.player.rect.centerx + self.rng.randint(-100, 100), 
+                          self.player.rect.centery + self.rng.randint(-50, 50))
             
-            boomerang = Boomerang(pos, target_pos)
+            boomerang = self.boomerang_pool.acquire(pos, target_pos)
             self.boomerangs.add(boomerang)
             self.all_sprites.add(boomerang)
             self.spawn_timer = current_time
     
     def check_collisions(self):
-        hits = pygame.sprite.spritecollide(self.player, self.boomerangs, False)
+        hits = self.boomerangs.collide(self.player)
         if hits:
-            self.game_over = True
+            self.enter_state("game_over")
     
     def next_level(self):
         self.level += 1
@@ -178,38 +533,51 @@ class Game:
         for boomerang in self.boomerangs:
             boomerang.kill()
             
-        # Display level message
-        self.show_level_message()
+        # Display level message for 2 seconds
+        self.enter_state("level_intro", 2000)
     
     def show_level_message(self):
         screen.fill(BLACK)
-        level_text = self.font.render(f"Level {self.level}", True, WHITE)
+        level_text = render_text(self.font, f"Level {self.level}", True, WHITE)
         level_rect = level_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
         screen.blit(level_text, level_rect)
         
-        instruction = self.font.render(f"Dodge {self.boomerang_count} boomerangs!", True, WHITE)
+        instruction = render_text(self.font, f"Dodge {self.boomerang_count} boomerangs!", True, WHITE)
         instruction_rect = instruction.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50))
         screen.blit(instruction, instruction_rect)
         
         pygame.display.flip()
-        pygame.time.delay(2000)  # Show for 2 seconds
     
     def draw_ui(self):
+        """Redraw the HUD into the background if its values changed; return the touched rects."""
+        hud_state = (self.score, self.level, self.boomerang_count)
+        if hud_state == self.hud_state:
+            return []
+        self.hud_state = hud_state
+        
+        # Erase the previous HUD text
+        dirty = self.hud_rects
+        for rect in dirty:
+            self.background.fill(BLACK, rect)
+        
         # Draw score and level
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        level_text = self.font.render(f"Level: {self.level}", True, WHITE)
-        boomerang_text = self.font.render(f"Boomerangs: {self.boomerang_count}", True, WHITE)
+        score_text = render_text(self.font, f"Score: {self.score}", True, WHITE)
+        level_text = render_text(self.font, f"Level: {self.level}", True, WHITE)
+        boomerang_text = render_text(self.font, f"Boomerangs: {self.boomerang_count}", True, WHITE)
         
-        screen.blit(score_text, (10, 10))
-        screen.blit(level_text, (10, 50))
-        screen.blit(boomerang_text, (10, 90))
+        self.hud_rects = [
+            self.background.blit(score_text, (10, 10)),
+            self.background.blit(level_text, (10, 50)),
+            self.background.blit(boomerang_text, (10, 90)),
+        ]
+        return dirty + self.hud_rects
     
     def game_over_screen(self):
         screen.fill(BLACK)
-        game_over_text = self.font.render("GAME OVER", True, RED)
-        score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-        level_text = self.font.render(f"You reached Level {self.level}", True, WHITE)
-        restart_text = self.font.render("Press R to restart or Q to quit", True, WHITE)
+        game_over_text = render_text(self.font, "GAME OVER", True, RED)
+        score_text = render_text(self.font, f"Final Score: {self.score}", True, WHITE)
+        level_text = render_text(self.font, f"You reached Level {self.level}", True, WHITE)
+        restart_text = render_text(self.font, "Press R to restart or Q to quit", True, WHITE)
         
         screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 60))
         screen.blit(score_text, (WIDTH // 2 - score_text.get_width() // 2, HEIGHT // 2))
@@ -217,58 +585,200 @@ class Game:
         screen.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2 + 100))
         
         pygame.display.flip()
+    
+    def step(self):
+        """Advance the game by one fixed timestep."""
+        with self.profiler.phase("wait"):
+            self.clock.tick(FPS)
+        self.steps += 1
         
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == KEYDOWN:
-                    if event.key == K_r:
-                        self.__init__()  # Reset the game
-                        self.show_level_message()
-                        waiting = False
-                    elif event.key == K_q:
-                        pygame.quit()
-                        sys.exit()
+        # Input is polled and recorded on every tick so replays stay in lockstep
+        keys = self.controller.get_keys(self)
+        if self.recorder is not None:
+            self.recorder.record(keys_to_bits(keys))
+        
+        if self.state == "game_over" and K_r in keys:
+            self.reset()
+        if self.state == "level_intro":
+            if self.clock.get_ticks() >= self.state_until:
+                self.enter_state("playing")
+            return
+        if self.state != "playing":
+            return
+        
+        with self.profiler.phase("update"):
+            self.player.update(keys)
+            for boomerang in self.projectiles.step():
+                boomerang.kill()
+            self.boomerangs.update()
+            self.spawn_boomerangs()
+        with self.profiler.phase("collision"):
+            self.check_collisions()
+        
+        # Check if all boomerangs for this level have been dodged
+        if not self.game_over and len(self.boomerangs) == 0 and self.clock.get_ticks() - self.spawn_timer > 3000:
+            self.score += self.level * 100
+            self.next_level()
     
-    def run(self):
-        self.show_level_message()
+    def draw(self):
+        # Level message and game over screens are static: draw them once on entry
+        if self.state != "playing":
+            if self.full_redraw:
+                if self.state == "level_intro":
+                    self.show_level_message()
+                else:
+                    self.game_over_screen()
+                self.full_redraw = False
+            return
         
-        # Main game loop
+        # Only regions touched by moving sprites or HUD changes are pushed to the display
+        with self.profiler.phase("draw"):
+            dirty = self.draw_ui()
+            if self.full_redraw:
+                screen.blit(self.background, (0, 0))
+            else:
+                self.all_sprites.clear(screen, self.background)
+                if self.overlay_rect:
+                    dirty.append(self.overlay_rect)  # Restore what the last overlay covered
+                for rect in dirty:
+                    screen.blit(self.background, rect, rect)
+            dirty += self.all_sprites.draw(screen)
+            
+            self.overlay_rect = self.profiler.draw_overlay(screen, self.overlay_font, (WIDTH - 330, 10))
+            if self.overlay_rect:
+                dirty.append(self.overlay_rect)
+        
+        with self.profiler.phase("flip"):
+            if self.full_redraw:
+                pygame.display.flip()
+                self.full_redraw = False
+            else:
+                pygame.display.update(dirty)
+    
+    def run(self):
+        # Main game loop: every scene is driven from here, nothing blocks
         running = True
         while running:
-            clock.tick(FPS)
+            self.profiler.begin_frame()
             
             # Process events
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    running = False
+            with self.profiler.phase("events"):
+                for event in pygame.event.get():
+                    if event.type == QUIT:
+                        running = False
+                    elif event.type == KEYDOWN and event.key == K_F3:
+                        self.profiler.toggle()
+                    elif event.type == KEYDOWN and event.key == K_q and self.game_over:
+                        running = False
                     
-            if not self.game_over:
-                # Update
-                self.all_sprites.update()
-                self.spawn_boomerangs()
-                self.check_collisions()
-                
-                # Check if all boomerangs for this level have been dodged
-                if len(self.boomerangs) == 0 and pygame.time.get_ticks() - self.spawn_timer > 3000:
-                    self.score += self.level * 100
-                    self.next_level()
-                
-                # Draw
-                screen.fill(BLACK)
-                self.all_sprites.draw(screen)
-                self.draw_ui()
-            else:
-                self.game_over_screen()
-                
-            pygame.display.flip()
+            self.step()
+            self.draw()
+            
+            pool = self.boomerang_pool.stats()
+            self.profiler.end_frame(sprites=len(self.all_sprites), boomerangs=len(self.boomerangs),
+                                    pool_free=pool["free"], pool_created=pool["created"])
             
         pygame.quit()
 
+# Run one game headlessly at a fixed timestep and return its outcome.
+# Returning boomerangs hover at the player's start point until they hit
+# something, so a player who keeps dodging them never clears the level:
+# the game is stopped as stalled once a level lasts stall_seconds.
+def simulate(seed=None, controller=None, max_steps=FPS * 60 * 10, record=None, stall_seconds=STALL_SECONDS):
+    game = Game(clock=FixedStepClock(), seed=seed, controller=controller, headless=True, record=bool(record))
+    level = game.level
+    level_start = 0
+    stalled = False
+    while not game.game_over and game.steps < max_steps:
+        game.step()
+        if game.level != level:
+            level = game.level
+            level_start = game.clock.get_ticks()
+        elif game.clock.get_ticks() - level_start >= stall_seconds * 1000:
+            stalled = True
+            break
+    if record:
+        game.recorder.save(record)
+    return {
+        "seed": game.seed,
+        "score": game.score,
+        "level": game.level,
+        "steps": game.steps,
+        "sim_seconds": game.clock.get_ticks() / 1000,
+        "game_over": game.game_over,
+        "stalled": stalled,
+        "pool": game.boomerang_pool.stats(),
+    }
+
+# Re-simulate a recorded session: headless at full speed, or rendered at the given speed
+def play_replay(path, speed=None):
+    replay = Replay.load(path)
+    controller = ReplayInput(replay)
+    if speed is None:
+        game = Game(clock=FixedStepClock(replay.step_ms), seed=replay.seed, controller=controller, headless=True)
+        while game.steps < replay.ticks:
+            game.step()
+    else:
+        game = Game(clock=RealtimeClock(replay.step_ms, speed), seed=replay.seed, controller=controller,
+                    headless=False)
+        running = True
+        while running and game.steps < replay.ticks:
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    running = False
+            game.step()
+            game.draw()
+    return {
+        "seed": replay.seed,
+        "score": game.score,
+        "level": game.level,
+        "steps": game.steps,
+        "game_over": game.game_over,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Boomerang Dodge")
+    parser.add_argument("--headless", action="store_true", help="simulate games without a window")
+    parser.add_argument("--games", type=int, default=1, help="number of headless games to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first headless game")
+    parser.add_argument("--max-steps", type=int, default=FPS * 60 * 10, help="step limit per headless game")
+    parser.add_argument("--stall-seconds", type=float, default=STALL_SECONDS,
+                        help="end a headless game once one level has lasted this many simulated seconds")
+    parser.add_argument("--profile-out", help="write per-frame timings to this .json or .csv file on exit")
+    parser.add_argument("--record", help="save a replay of the session to this file")
+    parser.add_argument("--replay", help="re-simulate a recorded replay file")
+    parser.add_argument("--speed", type=float, help="render the replay at this speed instead of headlessly")
+    args = parser.parse_args()
+    
+    if args.replay:
+        try:
+            result = play_replay(args.replay, None if args.headless else args.speed)
+        except ValueError as error:
+            parser.error(f"{args.replay}: {error}")
+        print(f"seed={result['seed']} score={result['score']} level={result['level']} "
+              f"steps={result['steps']} game_over={result['game_over']}")
+        return
+        
+    if not args.headless:
+        profiler = FrameProfiler(record=bool(args.profile_out))
+        game = Game(profiler=profiler, record=bool(args.record))
+        game.run()
+        if args.profile_out:
+            profiler.export(args.profile_out)
+        if args.record:
+            game.recorder.save(args.record)
+        return
+        
+    for i in range(args.games):
+        record = args.record
+        if record and args.games > 1:
+            root, ext = os.path.splitext(record)
+            record = f"{root}.{args.seed + i}{ext}"
+        result = simulate(seed=args.seed + i, max_steps=args.max_steps, record=record,
+                          stall_seconds=args.stall_seconds)
+        print(f"seed={result['seed']} score={result['score']} level={result['level']} "
+              f"steps={result['steps']} sim_time={result['sim_seconds']:.1f}s stalled={result['stalled']}")
+
 # Start the game
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    main()
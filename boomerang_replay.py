@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compact binary replay format for Boomerang Dodge.
+A replay is the RNG seed plus one input bitfield per simulation tick.
+Consecutive identical bitfields are run-length encoded, so a session that
+holds the same keys for seconds at a time costs a couple of bytes.
+
+Layout (little endian):
+    magic "BDRP", version u8, seed i64, step_ms f64, tick count u32,
+    then (bitfield u8, run length varint) pairs until the end of the file.
+"""
+
+import struct
+
+MAGIC = b"BDRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBqdI")
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Replay is truncated")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+class ReplayRecorder:
+    def __init__(self, seed, step_ms):
+        self.seed = seed
+        self.step_ms = step_ms
+        self.runs = []  # [bitfield, run length]
+        self.ticks = 0
+
+    def record(self, bits):
+        if self.runs and self.runs[-1][0] == bits:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+        self.ticks += 1
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.step_ms, self.ticks))
+        for bits, length in self.runs:
+            out.append(bits)
+            write_varint(out, length)
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+class Replay:
+    def __init__(self, seed, step_ms, runs):
+        self.seed = seed
+        self.step_ms = step_ms
+        self.runs = runs
+        self.ticks = sum(length for _, length in runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Replay is truncated")
+        magic, version, seed, step_ms, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a Boomerang Dodge replay")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+
+        runs = []
+        offset = HEADER.size
+        while offset < len(data):
+            bits = data[offset]
+            length, offset = read_varint(data, offset + 1)
+            runs.append((bits, length))
+        replay = cls(seed, step_ms, runs)
+        if replay.ticks != ticks:
+            raise ValueError(f"Replay is truncated: expected {ticks} ticks, found {replay.ticks}")
+        return replay
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def inputs(self):
+        """Yield the recorded bitfield for every tick in order."""
+        for bits, length in self.runs:
+            for _ in range(length):
+                yield bits
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled, indexed country catalog for the country puzzle games.
+country_data.json nests every language's names, hints and info under each
+country, so loading it parses everything even when only one language is
+played. The catalog splits it into a core table (country keys and flags)
+and one string pool per language, each in its own memory-mapped file:
+a process only touches the pages of the language it actually shows.
+
+Build it from the JSON with:
+    python country_catalog.py [country_data.json] [--out country_data]
+which writes country_data.cat plus country_data.<lang>.cat per language.
+
+Every file starts with (magic, version u8, country count u32, n u32)
+and ends with a string pool: count u32, count + 1 offsets u32, UTF-8 data.
+Identical strings are stored once and decoded strings are interned.
+    core:     n languages; country_count x (key id u32, flag id u32);
+              n x language code id u32
+    language: n refs; country_count x (name id, first hint ref, hint count,
+              first info ref, info count) u32; n x string id u32
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+
+CORE_MAGIC = b"CCAT"
+LANGUAGE_MAGIC = b"CLNG"
+VERSION = 1
+HEADER = struct.Struct("<4sBII")
+U32 = struct.Struct("<I")
+CORE_RECORD = struct.Struct("<II")
+LANGUAGE_RECORD = struct.Struct("<IIIII")
+FALLBACK_LANGUAGE = "en"
+
+# Building
+
+class StringPoolBuilder:
+    def __init__(self):
+        self.ids = {}  # string -> id; identical strings share one id
+        self.strings = []
+
+    def add(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[text] = string_id
+            self.strings.append(text)
+        return string_id
+
+    def to_bytes(self):
+        encoded = [text.encode("utf-8") for text in self.strings]
+        out = bytearray(U32.pack(len(encoded)))
+        offset = 0
+        out += U32.pack(offset)
+        for data in encoded:
+            offset += len(data)
+            out += U32.pack(offset)
+        for data in encoded:
+            out += data
+        return bytes(out)
+
+def catalog_languages(countries):
+    languages = []
+    for country in countries.values():
+        for language in country["names"]:
+            if language not in languages:
+                languages.append(language)
+    return languages
+
+def localized(country, field, language):
+    # Gaps in a language are filled from English when the catalog is built
+    values = country[field]
+    return values[language] if language in values else values[FALLBACK_LANGUAGE]
+
+def compile_core(countries, languages):
+    pool = StringPoolBuilder()
+    out = bytearray(HEADER.pack(CORE_MAGIC, VERSION, len(countries), len(languages)))
+    for key, country in countries.items():
+        out += CORE_RECORD.pack(pool.add(key), pool.add(country["flag"]))
+    for language in languages:
+        out += U32.pack(pool.add(language))
+    return bytes(out + pool.to_bytes())
+
+def compile_language(countries, language):
+    pool = StringPoolBuilder()
+    records = bytearray()
+    refs = []
+    for country in countries.values():
+        name_id = pool.add(localized(country, "names", language))
+        hints = [pool.add(hint) for hint in localized(country, "hints", language)]
+        info = [pool.add(line) for line in localized(country, "info", language)]
+        records += LANGUAGE_RECORD.pack(name_id, len(refs), len(hints), len(refs) + len(hints), len(info))
+        refs += hints + info
+    out = bytearray(HEADER.pack(LANGUAGE_MAGIC, VERSION, len(countries), len(refs)))
+    out += records
+    for string_id in refs:
+        out += U32.pack(string_id)
+    return bytes(out + pool.to_bytes())
+
+def compile_catalog(countries):
+    """Compile a country_data.json style dict to (core bytes, {language: bytes})."""
+    languages = catalog_languages(countries)
+    return (compile_core(countries, languages),
+            {language: compile_language(countries, language) for language in languages})
+
+def core_path(base):
+    return f"{base}.cat"
+
+def language_path(base, language):
+    return f"{base}.{language}.cat"
+
+def build(json_path="country_data.json", base="country_data"):
+    with open(json_path, "r", encoding="utf-8") as file:
+        countries = json.load(file)
+    core, languages = compile_catalog(countries)
+    paths = [core_path(base)]
+    with open(paths[0], "wb") as file:
+        file.write(core)
+    for language, data in languages.items():
+        paths.append(language_path(base, language))
+        with open(paths[-1], "wb") as file:
+            file.write(data)
+    return paths
+
+# Reading
+
+def map_file(path):
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def read_header(buffer, magic, path):
+    found, version, count, extra = HEADER.unpack_from(buffer)
+    if found != magic:
+        raise ValueError(f"{path} is not a country catalog file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported country catalog version {version} in {path}")
+    return count, extra
+
+class StringPool:
+    def __init__(self, buffer, offset):
+        self.buffer = buffer
+        self.count = U32.unpack_from(buffer, offset)[0]
+        self.offsets = offset + U32.size
+        self.data = self.offsets + U32.size * (self.count + 1)
+        self.decoded = {}  # id -> interned str, filled on first access
+
+    def __getitem__(self, string_id):
+        text = self.decoded.get(string_id)
+        if text is None:
+            start, end = struct.unpack_from("<II", self.buffer, self.offsets + U32.size * string_id)
+            text = sys.intern(str(self.buffer[self.data + start:self.data + end], "utf-8"))
+            self.decoded[string_id] = text
+        return text
+
+class LanguageTable:
+    def __init__(self, buffer, country_count, name="<memory>"):
+        count, ref_count = read_header(buffer, LANGUAGE_MAGIC, name)
+        if count != country_count:
+            raise ValueError(f"{name} has {count} countries, the catalog has {country_count}")
+        self.buffer = buffer
+        self.records = HEADER.size
+        self.refs = self.records + LANGUAGE_RECORD.size * count
+        self.strings = StringPool(buffer, self.refs + U32.size * ref_count)
+
+    def record(self, index):
+        return LANGUAGE_RECORD.unpack_from(self.buffer, self.records + LANGUAGE_RECORD.size * index)
+
+    def lines(self, first, count):
+        refs = struct.unpack_from(f"<{count}I", self.buffer, self.refs + U32.size * first)
+        return tuple(self.strings[string_id] for string_id in refs)
+
+    def name(self, index):
+        return self.strings[self.record(index)[0]]
+
+    def hints(self, index):
+        _, first, count, _, _ = self.record(index)
+        return self.lines(first, count)
+
+    def info(self, index):
+        _, _, _, first, count = self.record(index)
+        return self.lines(first, count)
+
+class CountryCatalog:
+    def __init__(self, core, open_language, name="<memory>"):
+        count, language_count = read_header(core, CORE_MAGIC, name)
+        strings = StringPool(core, HEADER.size + CORE_RECORD.size * count + U32.size * language_count)
+        records = [CORE_RECORD.unpack_from(core, HEADER.size + CORE_RECORD.size * i) for i in range(count)]
+        # Prebuilt index: sampling and lookups never rebuild key lists
+        self.keys = tuple(strings[key_id] for key_id, _ in records)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.flags = tuple(strings[flag_id] for _, flag_id in records)
+        languages_offset = HEADER.size + CORE_RECORD.size * count
+        self.languages = tuple(strings[U32.unpack_from(core, languages_offset + U32.size * i)[0]]
+                               for i in range(language_count))
+        self.open_language = open_language
+        self.tables = {}  # language -> LanguageTable, opened on first use
+
+    @classmethod
+    def open(cls, base="country_data"):
+        """Memory-map a compiled catalog; language pools are mapped on first use."""
+        path = core_path(base)
+        def open_language(language):
+            return map_file(language_path(base, language))
+        return cls(map_file(path), open_language, path)
+
+    @classmethod
+    def from_dict(cls, countries):
+        """Compile a country_data.json style dict in memory."""
+        core, languages = compile_catalog(countries)
+        return cls(core, languages.__getitem__)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def language(self, language):
+        table = self.tables.get(language)
+        if table is None:
+            if language not in self.languages:
+                raise KeyError(f"No {language!r} strings in the country catalog")
+            table = LanguageTable(self.open_language(language), len(self.keys), language)
+            self.tables[language] = table
+        return table
+
+    def release(self, language):
+        """Forget a language's table; its pool is unmapped once nothing references it."""
+        self.tables.pop(language, None)
+
+    def flag(self, key):
+        return self.flags[self.index[key]]
+
+    def name(self, key, language):
+        return self.language(language).name(self.index[key])
+
+    def hints(self, key, language):
+        return self.language(language).hints(self.index[key])
+
+    def info(self, key, language):
+        return self.language(language).info(self.index[key])
+
+    def sample(self, count, rng=random):
+        """Pick up to count distinct country keys."""
+        return rng.sample(self.keys, min(count, len(self.keys)))
+
+def load_catalog(json_path="country_data.json", base="country_data"):
+    """Open the compiled catalog, or compile the JSON in memory if any compiled file is missing or stale."""
+    json_mtime = os.path.getmtime(json_path) if os.path.exists(json_path) else None
+
+    def fresh(path):
+        return os.path.exists(path) and (json_mtime is None or os.path.getmtime(path) >= json_mtime)
+
+    if fresh(core_path(base)):
+        catalog = CountryCatalog.open(base)
+        if all(fresh(language_path(base, language)) for language in catalog.languages):
+            return catalog
+    if json_mtime is None:
+        raise FileNotFoundError(json_path)
+    with open(json_path, "r", encoding="utf-8") as file:
+        return CountryCatalog.from_dict(json.load(file))
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile country_data.json into a memory-mapped catalog")
+    parser.add_argument("json_path", nargs="?", default="country_data.json")
+    parser.add_argument("--out", default="country_data", help="output path prefix")
+    args = parser.parse_args()
+    for path in build(args.json_path, args.out):
+        print(f"Wrote {path} ({os.path.getsize(path)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import random
 import time
-import json
 import os
 from termcolor import colored
 import emoji
+from country_catalog import CountryCatalog, load_catalog
+from localization import Localization
+from quiz_engine import NEXT_ROUND_DELAY, QuizSession
 
 # Language support
 LANGUAGES = {
@@ -15,24 +16,13 @@ LANGUAGES = {
     "gujarati": "gu"
 }
 
-# Load language data
-def load_language_data(lang_code):
-    try:
-        with open(f"language_data_{lang_code}.json", "r", encoding="utf-8") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        print(f"Language data for {lang_code} not found. Defaulting to English.")
-        with open("language_data_en.json", "r", encoding="utf-8") as file:
-            return json.load(file)
-
 # Load country data
 def load_countries():
     try:
-        with open("country_data.json", "r", encoding="utf-8") as file:
-            return json.load(file)
+        return load_catalog("country_data.json")
     except FileNotFoundError:
         print("Country data file not found. Creating a sample dataset.")
-        return create_sample_countries()
+        return CountryCatalog.from_dict(create_sample_countries())
 
 def create_sample_countries():
     # Sample data with just a few countries
@@ -114,13 +104,10 @@ def create_sample_countries():
 class CountryPuzzleGame:
     def __init__(self, language="en"):
         self.language = language
-        self.lang_data = load_language_data(language)
         self.countries = load_countries()
-        self.score = 0
-        self.total_time = 0
-        self.rounds_played = 0
-        self.game_over = False
-        self.tries_remaining = 3
+        self.localization = Localization(self.countries)
+        self.lang_data = self.localization.get(language)
+        self.session = QuizSession(self.countries, self.lang_data, clock=time.time)
         
     def display_title(self):
         os.system('clear' if os.name == 'posix' else 'cls')
@@ -130,48 +117,34 @@ class CountryPuzzleGame:
         print(colored(self.lang_data["welcome_message"], 'green'))
         print(colored("=" * 60, 'yellow'))
         
-    def select_random_countries(self, count=5):
-        """Select random countries for options"""
-        available_countries = list(self.countries.keys())
-        if len(available_countries) < count:
-            count = len(available_countries)
-        return random.sample(available_countries, count)
-        
     def play_round(self):
         """Play a single round of the game"""
-        if self.game_over:
+        session = self.session
+        if session.game_over:
             self.show_game_over()
             return
             
-        selected_countries = self.select_random_countries()
-        correct_country = random.choice(selected_countries)
-        country_data = self.countries[correct_country]
-        
-        hints = country_data["hints"][self.language]
-        max_hints = len(hints)
+        selected_countries = session.new_round()
+        correct_country = session.correct_country
+        max_hints = len(session.hints)
         
         print(colored(self.lang_data["new_round"], 'magenta'))
         print(colored(self.lang_data["instructions"], 'yellow'))
         
-        start_time = time.time()
-        correct_guess = False
-        self.tries_remaining = 3  # Reset tries for new round
-        current_hint_index = 0
-        
         # Display options with flags
         print(colored(self.lang_data["options"], 'cyan'))
         for i, country in enumerate(selected_countries, 1):
-            flag = self.countries[country]["flag"]
-            translated_name = self.countries[country]["names"][self.language]
+            flag = self.countries.flag(country)
+            translated_name = self.lang_data.name(country)
             print(f"{i}. {emoji.emojize(flag)} {translated_name}")
         
-        while current_hint_index < len(hints) and self.tries_remaining > 0 and not correct_guess:
-            print(colored(f"\n{self.lang_data['hint']} {current_hint_index + 1}/{max_hints}:", 'green'))
-            print(colored(hints[current_hint_index], 'white'))
+        while session.round_active:
+            print(colored(f"\n{self.lang_data['hint']} {session.hint_index + 1}/{max_hints}:", 'green'))
+            print(colored(session.hint, 'white'))
             
             # Display tries remaining
-            tries_color = 'red' if self.tries_remaining == 1 else 'yellow'
-            print(colored(f"Tries remaining: {self.tries_remaining}", tries_color))
+            tries_color = 'red' if session.tries_remaining == 1 else 'yellow'
+            print(colored(f"Tries remaining: {session.tries_remaining}", tries_color))
             
             # Get user guess
             while True:
@@ -185,55 +158,31 @@ class CountryPuzzleGame:
                     print(colored(self.lang_data["invalid_input"], 'red'))
             
             # Check if guess is correct
-            if selected_countries[guess-1] == correct_country:
-                correct_guess = True
-                end_time = time.time()
-                time_taken = end_time - start_time
-                
-                # Calculate points (more points for fewer hints and faster guessing)
-                hint_factor = (max_hints - current_hint_index) / max_hints
-                time_factor = max(0, 1 - (time_taken / 60))  # Time factor decreases as time increases
-                points = int((hint_factor * 70 + time_factor * 30) * 10)
-                
-                self.score += points
-                self.total_time += time_taken
-                self.rounds_played += 1
-                
+            result = session.guess(selected_countries[guess-1])
+            if result.correct:
                 print(colored(self.lang_data["correct_guess"], 'green'))
-                print(colored(f"{self.lang_data['points_earned']}: {points}", 'cyan'))
-                print(colored(f"{self.lang_data['time_taken']}: {time_taken:.2f} {self.lang_data['seconds']}", 'cyan'))
+                print(colored(f"{self.lang_data['points_earned']}: {result.points}", 'cyan'))
+                print(colored(f"{self.lang_data['time_taken']}: {result.time_taken:.2f} {self.lang_data['seconds']}", 'cyan'))
                 
                 # Display country info
                 print(colored("\n" + "=" * 40, 'yellow'))
-                print(colored(f"{self.lang_data['country_info']} {self.countries[correct_country]['names'][self.language]}:", 'magenta'))
-                for info in self.countries[correct_country]["info"][self.language]:
+                print(colored(f"{self.lang_data['country_info']} {self.lang_data.name(correct_country)}:", 'magenta'))
+                for info in self.lang_data.info(correct_country):
                     print(colored(f"• {info}", 'white'))
                 print(colored("=" * 40, 'yellow'))
                 
-                print(colored("Next country in 3 seconds...", 'magenta'))
-                time.sleep(3)  # Pause before next round
+                print(colored(f"Next country in {NEXT_ROUND_DELAY} seconds...", 'magenta'))
+                time.sleep(NEXT_ROUND_DELAY)  # Pause before next round
                 
+            elif result.game_over:
+                # Game over after 3 wrong tries
+                print(colored(f"{self.lang_data['wrong_guess']} {self.lang_data['correct_answer']} {self.lang_data.name(correct_country)}.", 'red'))
+                print(colored("Game over! You've used all your tries.", 'red'))
+                time.sleep(2)  # Pause before showing game over screen
+            elif result.new_hint:
+                print(colored(f"{self.lang_data['wrong_guess']} {session.tries_remaining} tries remaining.", 'red'))
             else:
-                self.tries_remaining -= 1
-                if self.tries_remaining > 0:
-                    # Show next hint if available and there are tries remaining
-                    if current_hint_index < max_hints - 1:
-                        current_hint_index += 1
-                        print(colored(f"{self.lang_data['wrong_guess']} {self.tries_remaining} tries remaining.", 'red'))
-                    else:
-                        print(colored(f"Wrong! No more hints. {self.tries_remaining} tries remaining.", 'red'))
-                else:
-                    # Game over after 3 wrong tries
-                    print(colored(f"{self.lang_data['wrong_guess']} {self.lang_data['correct_answer']} {self.countries[correct_country]['names'][self.language]}.", 'red'))
-                    self.rounds_played += 1
-                    self.game_over = True
-                    print(colored("Game over! You've used all your tries.", 'red'))
-                    time.sleep(2)  # Pause before showing game over screen
-                
-        if not correct_guess and not self.game_over:
-            print(colored(self.lang_data["no_more_hints"], 'red'))
-            print(colored(f"{self.lang_data['correct_answer']}: {self.countries[correct_country]['names'][self.language]}", 'green'))
-            self.rounds_played += 1
+                print(colored(f"Wrong! No more hints. {session.tries_remaining} tries remaining.", 'red'))
             
     def show_game_over(self):
         """Display game over screen"""
@@ -242,8 +191,8 @@ class CountryPuzzleGame:
         print(colored("*" + "GAME OVER".center(58) + "*", 'red'))
         print(colored("*" * 60, 'red'))
         
-        print(colored(f"\nFinal Score: {self.score}", 'cyan'))
-        print(colored(f"Countries guessed correctly: {self.rounds_played - 1}", 'cyan'))
+        print(colored(f"\nFinal Score: {self.session.score}", 'cyan'))
+        print(colored(f"Countries guessed correctly: {self.session.rounds_played - 1}", 'cyan'))
         
         print(colored("\n1. Play Again", 'yellow'))
         print(colored("2. Main Menu", 'yellow'))
@@ -253,16 +202,10 @@ class CountryPuzzleGame:
             try:
                 choice = int(input(colored("Enter your choice: ", 'yellow')))
                 if choice == 1:
-                    self.game_over = False
-                    self.score = 0
-                    self.rounds_played = 0
-                    self.total_time = 0
+                    self.session.reset()
                     return
                 elif choice == 2:
-                    self.game_over = False
-                    self.score = 0
-                    self.rounds_played = 0
-                    self.total_time = 0
+                    self.session.reset()
                     return "main_menu"
                 elif choice == 3:
                     return "exit"
@@ -275,11 +218,11 @@ class CountryPuzzleGame:
         """Display the current score"""
         print(colored("\n" + "=" * 40, 'yellow'))
         print(colored(self.lang_data["score_summary"], 'cyan'))
-        print(colored(f"{self.lang_data['total_score']}: {self.score}", 'green'))
-        print(colored(f"{self.lang_data['rounds_played']}: {self.rounds_played}", 'green'))
+        print(colored(f"{self.lang_data['total_score']}: {self.session.score}", 'green'))
+        print(colored(f"{self.lang_data['rounds_played']}: {self.session.rounds_played}", 'green'))
         
-        if self.rounds_played > 0:
-            avg_time = self.total_time / self.rounds_played
+        if self.session.rounds_played > 0:
+            avg_time = self.session.total_time / self.session.rounds_played
             print(colored(f"{self.lang_data['avg_time']}: {avg_time:.2f} {self.lang_data['seconds']}", 'green'))
             
         print(colored("=" * 40, 'yellow'))
@@ -296,7 +239,8 @@ class CountryPuzzleGame:
                 if 1 <= choice <= len(LANGUAGES):
                     lang_code = list(LANGUAGES.values())[choice-1]
                     self.language = lang_code
-                    self.lang_data = load_language_data(lang_code)
+                    self.lang_data = self.localization.get(lang_code)
+                    self.session.pack = self.lang_data
                     break
                 else:
                     print(colored(self.lang_data["invalid_choice"], 'red'))
@@ -316,7 +260,7 @@ class CountryPuzzleGame:
             try:
                 choice = int(input(colored(self.lang_data["menu_choice"], 'yellow')))
                 if choice == 1:
-                    while not self.game_over:
+                    while not self.session.game_over:
                         self.play_round()
                     result = self.show_game_over()
                     if result == "exit":
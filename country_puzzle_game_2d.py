@@ -3,12 +3,19 @@
 
 import pygame
 import sys
-import random
 import time
-import json
 import os
 import math
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pygame.locals import *
+from text_cache import get_font, render_text, text_cache
+from text_layout import text_layout
+from frame_profiler import FrameProfiler
+from country_catalog import load_catalog
+from localization import Localization
+from quiz_engine import QuizSession
 
 # Initialize pygame
 pygame.init()
@@ -36,71 +43,143 @@ LANGUAGES = {
     "gujarati": "gu"
 }
 
-# Load language data
-def load_language_data(lang_code):
-    try:
-        with open(f"language_data_{lang_code}.json", "r", encoding="utf-8") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        print(f"Language data for {lang_code} not found. Defaulting to English.")
-        with open("language_data_en.json", "r", encoding="utf-8") as file:
-            return json.load(file)
-
 # Load country data
 def load_countries():
     try:
-        with open("country_data.json", "r", encoding="utf-8") as file:
-            return json.load(file)
+        return load_catalog("country_data.json")
     except FileNotFoundError:
         print("Country data file not found.")
         sys.exit(1)
 
-# Load flag images
-def load_flag_images(countries):
-    flag_images = {}
-    for country_key in countries:
-        try:
-            flag_path = f"flags/{country_key}.png"
+# Flags are decoded lazily: a small thread pool prefetches the flags of upcoming
+# rounds and decoded surfaces are kept in a bounded LRU
+class FlagLoader:
+    def __init__(self, countries, max_decoded=32, workers=2):
+        self.countries = countries
+        self.max_decoded = max_decoded
+        self.decoded = OrderedDict()  # country_key -> display-format surface, in LRU order
+        self.pending = {}             # country_key -> Future of the decoded image
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="flag-decode")
+        
+    def flag_path(self, country_key):
+        return f"flags/{country_key}.png"
+        
+    def prefetch(self, country_keys):
+        for country_key in country_keys:
+            if country_key in self.decoded or country_key in self.pending:
+                continue
+            flag_path = self.flag_path(country_key)
             if os.path.exists(flag_path):
-                flag_images[country_key] = pygame.image.load(flag_path)
+                self.pending[country_key] = self.executor.submit(pygame.image.load, flag_path)
+                
+    def get(self, country_key):
+        flag = self.decoded.get(country_key)
+        if flag is not None:
+            self.decoded.move_to_end(country_key)
+            return flag
+            
+        try:
+            future = self.pending.pop(country_key, None)
+            flag_path = self.flag_path(country_key)
+            if future is not None:
+                image = future.result()
+            elif os.path.exists(flag_path):
+                image = pygame.image.load(flag_path)
             else:
-                # Create a placeholder flag if image doesn't exist
-                flag_surface = pygame.Surface((120, 80))
-                flag_surface.fill(LIGHT_BLUE)
-                pygame.draw.rect(flag_surface, BLACK, (0, 0, 120, 80), 2)
-                font = pygame.font.SysFont('Arial', 14)
-                text = font.render(countries[country_key]["names"]["en"], True, BLACK)
-                flag_surface.blit(text, (10, 30))
-                flag_images[country_key] = flag_surface
+                image = self.create_placeholder(country_key)
+            # Convert to the display format once, on the main thread
+            flag = image.convert_alpha() if image.get_flags() & SRCALPHA else image.convert()
         except Exception as e:
             print(f"Error loading flag for {country_key}: {e}")
-            flag_surface = pygame.Surface((120, 80))
-            flag_surface.fill(LIGHT_BLUE)
-            flag_images[country_key] = flag_surface
-    return flag_images
+            flag = pygame.Surface((120, 80))
+            flag.fill(LIGHT_BLUE)
+            
+        self.decoded[country_key] = flag
+        if len(self.decoded) > self.max_decoded:
+            self.decoded.popitem(last=False)  # Evict the least recently used flag
+        return flag
+        
+    def create_placeholder(self, country_key):
+        # Create a placeholder flag if image doesn't exist
+        flag_surface = pygame.Surface((120, 80))
+        flag_surface.fill(LIGHT_BLUE)
+        pygame.draw.rect(flag_surface, BLACK, (0, 0, 120, 80), 2)
+        text = get_font('Arial', 14).render(self.countries.name(country_key, "en"), True, BLACK)
+        flag_surface.blit(text, (10, 30))
+        return flag_surface
+        
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# Pre-scaled flag textures per target size
+class FlagTextureCache:
+    def __init__(self, max_scaled=64):
+        self.max_scaled = max_scaled
+        self.scaled = OrderedDict() # (country_key, size) -> scaled surface, in LRU order
+        
+    def get(self, country_key, image, size):
+        key = (country_key, size)
+        scaled = self.scaled.get(key)
+        if scaled is not None:
+            self.scaled.move_to_end(key)
+            return scaled
+            
+        if image.get_size() == size:
+            scaled = image
+        else:
+            scaled = pygame.transform.scale(image, size)
+        self.scaled[key] = scaled
+        if len(self.scaled) > self.max_scaled:
+            self.scaled.popitem(last=False)  # Evict the least recently used size
+        return scaled
+
+# Shared across rounds and buttons
+flag_textures = FlagTextureCache()
 
-# Button class
+# Button class (retained mode: normal and hover looks are rendered once and reused)
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, text_color=BLACK, font_size=24):
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
         self.color = color
         self.hover_color = hover_color
         self.text_color = text_color
-        self.font = pygame.font.SysFont('Arial', font_size)
+        self.font = get_font('Arial', font_size)
         self.is_hovered = False
+        self.dirty = False  # Hover state changed since the last draw
+        self.text = text
         
-    def draw(self, surface):
-        color = self.hover_color if self.is_hovered else self.color
-        pygame.draw.rect(surface, color, self.rect)
-        pygame.draw.rect(surface, BLACK, self.rect, 2)  # Border
+    @property
+    def text(self):
+        return self._text
+        
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.surfaces = None  # Re-render both looks on next draw
+        self.dirty = True
         
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
+    def render(self, color):
+        surface = pygame.Surface(self.rect.size)
+        local_rect = surface.get_rect()
+        pygame.draw.rect(surface, color, local_rect)
+        pygame.draw.rect(surface, BLACK, local_rect, 2)  # Border
+        
+        text_surface = render_text(self.font, self.text, True, self.text_color)
+        text_rect = text_surface.get_rect(center=local_rect.center)
         surface.blit(text_surface, text_rect)
+        return surface
+        
+    def draw(self, surface):
+        if self.surfaces is None:
+            self.surfaces = (self.render(self.color), self.render(self.hover_color))
+        self.dirty = False
+        return surface.blit(self.surfaces[self.is_hovered], self.rect)
         
     def check_hover(self, pos):
-        self.is_hovered = self.rect.collidepoint(pos)
+        is_hovered = bool(self.rect.collidepoint(pos))
+        if is_hovered != self.is_hovered:
+            self.is_hovered = is_hovered
+            self.dirty = True
         return self.is_hovered
         
     def is_clicked(self, pos, event):
@@ -115,62 +194,67 @@ class CountryButton(Button):
         self.country_key = country_key
         self.flag_image = flag_image
         
-    def draw(self, surface):
-        super().draw(surface)
+        # Flag size and position (relative to the button) only depend on the button geometry
+        if flag_image:
+            self.flag_size = (min(flag_image.get_width(), width - 20), min(flag_image.get_height(), height - 60))
+            self.flag_pos = ((width - self.flag_size[0]) // 2, 10)
+        
+    def render(self, color):
+        surface = super().render(color)
         
         # Draw flag image
         if self.flag_image:
-            flag_rect = self.flag_image.get_rect()
-            flag_rect.width = min(flag_rect.width, self.rect.width - 20)
-            flag_rect.height = min(flag_rect.height, self.rect.height - 60)
-            scaled_flag = pygame.transform.scale(self.flag_image, (flag_rect.width, flag_rect.height))
-            
-            flag_x = self.rect.x + (self.rect.width - flag_rect.width) // 2
-            flag_y = self.rect.y + 10
-            surface.blit(scaled_flag, (flag_x, flag_y))
+            scaled_flag = flag_textures.get(self.country_key, self.flag_image, self.flag_size)
+            surface.blit(scaled_flag, self.flag_pos)
             
             # Draw country name below flag
-            text_surface = self.font.render(self.text, True, self.text_color)
-            text_rect = text_surface.get_rect(center=(self.rect.centerx, self.rect.bottom - 20))
+            text_surface = render_text(self.font, self.text, True, self.text_color)
+            text_rect = text_surface.get_rect(center=(self.rect.width // 2, self.rect.height - 20))
             surface.blit(text_surface, text_rect)
+        return surface
 
 # Game class
 class CountryPuzzleGame:
-    def __init__(self):
+    def __init__(self, profile_out=None, event_driven=True):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Country Puzzle Game")
         self.clock = pygame.time.Clock()
         self.language = "en"
-        self.lang_data = load_language_data(self.language)
         self.countries = load_countries()
-        self.flag_images = load_flag_images(self.countries)
-        self.score = 0
-        self.total_time = 0
-        self.rounds_played = 0
+        self.localization = Localization(self.countries)
+        self.lang_data = self.localization.get(self.language)
+        self.flags = FlagLoader(self.countries)
+        # Round rules (options, hints, tries, scoring) live in the shared session
+        self.session = QuizSession(self.countries, self.lang_data, clock=time.time)
         self.state = "main_menu"
         self.buttons = []
         self.country_buttons = []
-        self.selected_countries = []
-        self.correct_country = ""
-        self.current_hint_index = 0
-        self.start_time = 0
+        self.next_countries = []  # Drawn a round ahead so their flags can be prefetched
         self.result_message = ""
         self.points_earned = 0
         self.time_taken = 0
-        self.tries_remaining = 3  # Maximum 3 tries per country
-        self.game_over = False    # Flag to indicate if game is over
         
         # Fonts
-        self.title_font = pygame.font.SysFont('Arial', 48, bold=True)
-        self.heading_font = pygame.font.SysFont('Arial', 36, bold=True)
-        self.normal_font = pygame.font.SysFont('Arial', 24)
-        self.hint_font = pygame.font.SysFont('Arial', 28)
+        self.title_font = get_font('Arial', 48, bold=True)
+        self.heading_font = get_font('Arial', 36, bold=True)
+        self.normal_font = get_font('Arial', 24)
+        self.hint_font = get_font('Arial', 28)
         
         # Background
         self.bg_color = LIGHT_BLUE
         
+        # Event-driven mode sleeps in pygame.event.wait until input or a timer arrives
+        self.event_driven = event_driven
+        
+        # Frame-time instrumentation (F3 toggles the overlay)
+        self.profile_out = profile_out
+        self.profiler = FrameProfiler(record=bool(profile_out))
+        self.overlay_font = get_font('Arial', 16)
+        
         # Create main menu buttons
         self.create_main_menu_buttons()
+        self.create_game_over_buttons()
+        self.needs_redraw = True  # Full repaint pending; otherwise only changed buttons are redrawn
         
     def create_main_menu_buttons(self):
         self.buttons = []
@@ -214,6 +298,25 @@ class CountryPuzzleGame:
             GRAY, WHITE
         ))
         
+    def create_game_over_buttons(self):
+        # Play again button
+        self.play_again_button = Button(
+            SCREEN_WIDTH // 2 - 150,
+            400,
+            300, 60,
+            "Play Again",
+            GRAY, WHITE
+        )
+        
+        # Main menu button
+        self.main_menu_button = Button(
+            SCREEN_WIDTH // 2 - 150,
+            480,
+            300, 60,
+            "Main Menu",
+            GRAY, WHITE
+        )
+        
     def create_language_buttons(self):
         self.buttons = []
         button_width = 300
@@ -249,9 +352,9 @@ class CountryPuzzleGame:
         start_y = SCREEN_HEIGHT - button_height - 50
         
         # Create buttons for each country option
-        for i, country_key in enumerate(self.selected_countries):
-            country_name = self.countries[country_key]["names"][self.language]
-            flag_image = self.flag_images.get(country_key)
+        for i, country_key in enumerate(self.session.options):
+            country_name = self.lang_data.name(country_key)
+            flag_image = self.flags.get(country_key)
             
             self.country_buttons.append(CountryButton(
                 start_x + i * (button_width + margin),
@@ -263,72 +366,54 @@ class CountryPuzzleGame:
                 GRAY, WHITE
             ))
             
-    def select_random_countries(self, count=5):
-        """Select random countries for options"""
-        available_countries = list(self.countries.keys())
-        if len(available_countries) < count:
-            count = len(available_countries)
-        return random.sample(available_countries, count)
+    def new_game(self):
+        self.state = "game"
+        self.session.reset()
+        self.start_new_round()
         
     def start_new_round(self):
-        if self.game_over:
+        session = self.session
+        if session.game_over:
             self.state = "game_over"
             return
             
-        self.selected_countries = self.select_random_countries()
-        self.correct_country = random.choice(self.selected_countries)
-        self.current_hint_index = 0
-        self.start_time = time.time()
+        options = self.next_countries or session.sample()
+        self.next_countries = session.sample()
+        self.flags.prefetch(self.next_countries)
+        session.new_round(options)
         self.result_message = ""
-        self.tries_remaining = 3  # Reset tries for new round
         self.create_country_buttons()
         
     def check_guess(self, country_key):
-        end_time = time.time()
-        self.time_taken = end_time - self.start_time
-        
-        if country_key == self.correct_country:
-            # Calculate points
-            max_hints = len(self.countries[self.correct_country]["hints"][self.language])
-            hint_factor = (max_hints - self.current_hint_index) / max_hints
-            time_factor = max(0, 1 - (self.time_taken / 60))
-            self.points_earned = int((hint_factor * 70 + time_factor * 30) * 10)
-            
-            self.score += self.points_earned
-            self.total_time += self.time_taken
-            self.rounds_played += 1
-            
+        session = self.session
+        correct_country = session.correct_country
+        result = session.guess(country_key)
+        self.time_taken = result.time_taken
+        
+        if result.correct:
+            self.points_earned = result.points
             self.result_message = self.lang_data["correct_guess"]
             
             # Automatically proceed to next round after a short delay
             pygame.time.set_timer(USEREVENT + 1, 1500)  # 1.5 second delay
-        else:
-            self.tries_remaining -= 1
+        elif result.game_over:
+            self.result_message = f"{self.lang_data['wrong_guess']} {self.lang_data['correct_answer']} {self.lang_data.name(correct_country)}."
             
-            if self.tries_remaining > 0:
-                # Show next hint if available
-                if self.current_hint_index < len(self.countries[self.correct_country]["hints"][self.language]) - 1:
-                    self.current_hint_index += 1
-                    self.result_message = f"{self.lang_data['wrong_guess']} {self.tries_remaining} tries remaining."
-                else:
-                    self.result_message = f"Wrong! No more hints. {self.tries_remaining} tries remaining."
-            else:
-                # Game over after 3 wrong tries
-                self.result_message = f"{self.lang_data['wrong_guess']} {self.lang_data['correct_answer']} {self.countries[self.correct_country]['names'][self.language]}."
-                self.rounds_played += 1
-                self.game_over = True
-                
-                # Show game over screen after a short delay
-                pygame.time.set_timer(USEREVENT + 2, 2000)  # 2 second delay
+            # Show game over screen after a short delay
+            pygame.time.set_timer(USEREVENT + 2, 2000)  # 2 second delay
+        elif result.new_hint:
+            self.result_message = f"{self.lang_data['wrong_guess']} {session.tries_remaining} tries remaining."
+        else:
+            self.result_message = f"Wrong! No more hints. {session.tries_remaining} tries remaining."
         
     def draw_main_menu(self):
         # Draw title
-        title_text = self.title_font.render(self.lang_data["game_title"], True, DARK_BLUE)
+        title_text = render_text(self.title_font, self.lang_data["game_title"], True, DARK_BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_text, title_rect)
         
         # Draw welcome message
-        welcome_text = self.normal_font.render(self.lang_data["welcome_message"], True, BLACK)
+        welcome_text = render_text(self.normal_font, self.lang_data["welcome_message"], True, BLACK)
         welcome_rect = welcome_text.get_rect(center=(SCREEN_WIDTH // 2, 220))
         self.screen.blit(welcome_text, welcome_rect)
         
@@ -338,7 +423,7 @@ class CountryPuzzleGame:
             
     def draw_language_menu(self):
         # Draw title
-        title_text = self.heading_font.render(self.lang_data["select_language"], True, DARK_BLUE)
+        title_text = render_text(self.heading_font, self.lang_data["select_language"], True, DARK_BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_text, title_rect)
         
@@ -348,7 +433,7 @@ class CountryPuzzleGame:
             
     def draw_score_screen(self):
         # Draw title
-        title_text = self.heading_font.render(self.lang_data["score_summary"], True, DARK_BLUE)
+        title_text = render_text(self.heading_font, self.lang_data["score_summary"], True, DARK_BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_text, title_rect)
         
@@ -356,17 +441,17 @@ class CountryPuzzleGame:
         y_pos = 250
         line_height = 40
         
-        score_text = self.normal_font.render(f"{self.lang_data['total_score']}: {self.score}", True, BLACK)
+        score_text = render_text(self.normal_font, f"{self.lang_data['total_score']}: {self.session.score}", True, BLACK)
         self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, y_pos))
         y_pos += line_height
         
-        rounds_text = self.normal_font.render(f"{self.lang_data['rounds_played']}: {self.rounds_played}", True, BLACK)
+        rounds_text = render_text(self.normal_font, f"{self.lang_data['rounds_played']}: {self.session.rounds_played}", True, BLACK)
         self.screen.blit(rounds_text, (SCREEN_WIDTH // 2 - rounds_text.get_width() // 2, y_pos))
         y_pos += line_height
         
-        if self.rounds_played > 0:
-            avg_time = self.total_time / self.rounds_played
-            time_text = self.normal_font.render(f"{self.lang_data['avg_time']}: {avg_time:.2f} {self.lang_data['seconds']}", True, BLACK)
+        if self.session.rounds_played > 0:
+            avg_time = self.session.total_time / self.session.rounds_played
+            time_text = render_text(self.normal_font, f"{self.lang_data['avg_time']}: {avg_time:.2f} {self.lang_data['seconds']}", True, BLACK)
             self.screen.blit(time_text, (SCREEN_WIDTH // 2 - time_text.get_width() // 2, y_pos))
         
         # Back button
@@ -385,62 +470,50 @@ class CountryPuzzleGame:
             
     def draw_game_screen(self):
         # Draw round title
-        title_text = self.heading_font.render(self.lang_data["new_round"], True, DARK_BLUE)
+        title_text = render_text(self.heading_font, self.lang_data["new_round"], True, DARK_BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
         self.screen.blit(title_text, title_rect)
         
         # Draw instructions
-        instr_text = self.normal_font.render(self.lang_data["instructions"], True, BLACK)
+        instr_text = render_text(self.normal_font, self.lang_data["instructions"], True, BLACK)
         instr_rect = instr_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
         self.screen.blit(instr_text, instr_rect)
         
         # Draw tries remaining
-        tries_text = self.normal_font.render(f"Tries remaining: {self.tries_remaining}", True, RED if self.tries_remaining == 1 else BLACK)
+        session = self.session
+        tries_text = render_text(self.normal_font, f"Tries remaining: {session.tries_remaining}", True, RED if session.tries_remaining == 1 else BLACK)
         tries_rect = tries_text.get_rect(center=(SCREEN_WIDTH // 2, 140))
         self.screen.blit(tries_text, tries_rect)
         
         # Draw current hint
-        if self.current_hint_index < len(self.countries[self.correct_country]["hints"][self.language]):
-            hint = self.countries[self.correct_country]["hints"][self.language][self.current_hint_index]
-            hint_label = self.normal_font.render(f"{self.lang_data['hint']} {self.current_hint_index + 1}/{len(self.countries[self.correct_country]['hints'][self.language])}", True, GREEN)
+        hints = session.hints
+        if session.hint_index < len(hints):
+            hint = hints[session.hint_index]
+            hint_label = render_text(self.normal_font, f"{self.lang_data['hint']} {session.hint_index + 1}/{len(hints)}", True, GREEN)
             self.screen.blit(hint_label, (50, 180))
             
-            # Wrap hint text
-            words = hint.split(' ')
-            lines = []
-            line = ""
-            for word in words:
-                test_line = line + word + " "
-                test_width = self.hint_font.size(test_line)[0]
-                if test_width < SCREEN_WIDTH - 100:
-                    line = test_line
-                else:
-                    lines.append(line)
-                    line = word + " "
-            lines.append(line)
-            
-            # Draw hint text
-            for i, line in enumerate(lines):
-                hint_text = self.hint_font.render(line, True, BLACK)
+            # Draw hint text, wrapped once per hint and language
+            hint_lines = text_layout.render(self.hint_font, hint, SCREEN_WIDTH - 100, BLACK, self.language)
+            for i, hint_text in enumerate(hint_lines):
                 self.screen.blit(hint_text, (50, 220 + i * 40))
                 
         # Draw result message if there is one
         if self.result_message:
-            result_text = self.heading_font.render(self.result_message, True, GREEN if "Correct" in self.result_message else RED)
+            result_text = render_text(self.heading_font, self.result_message, True, GREEN if "Correct" in self.result_message else RED)
             result_rect = result_text.get_rect(center=(SCREEN_WIDTH // 2, 350))
             self.screen.blit(result_text, result_rect)
             
             if "Correct" in self.result_message:
-                points_text = self.normal_font.render(f"{self.lang_data['points_earned']}: {self.points_earned}", True, BLACK)
+                points_text = render_text(self.normal_font, f"{self.lang_data['points_earned']}: {self.points_earned}", True, BLACK)
                 points_rect = points_text.get_rect(center=(SCREEN_WIDTH // 2, 400))
                 self.screen.blit(points_text, points_rect)
                 
-                time_text = self.normal_font.render(f"{self.lang_data['time_taken']}: {self.time_taken:.2f} {self.lang_data['seconds']}", True, BLACK)
+                time_text = render_text(self.normal_font, f"{self.lang_data['time_taken']}: {self.time_taken:.2f} {self.lang_data['seconds']}", True, BLACK)
                 time_rect = time_text.get_rect(center=(SCREEN_WIDTH // 2, 440))
                 self.screen.blit(time_text, time_rect)
                 
                 # Show "Next country in X seconds" message
-                next_text = self.normal_font.render("Next country in 1.5 seconds...", True, PURPLE)
+                next_text = render_text(self.normal_font, "Next country in 1.5 seconds...", True, PURPLE)
                 next_rect = next_text.get_rect(center=(SCREEN_WIDTH // 2, 480))
                 self.screen.blit(next_text, next_rect)
                 
@@ -450,150 +523,168 @@ class CountryPuzzleGame:
             
     def draw_game_over_screen(self):
         # Draw game over title
-        title_text = self.title_font.render("GAME OVER", True, RED)
+        title_text = render_text(self.title_font, "GAME OVER", True, RED)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_text, title_rect)
         
         # Draw final score
-        score_text = self.heading_font.render(f"Final Score: {self.score}", True, DARK_BLUE)
+        score_text = render_text(self.heading_font, f"Final Score: {self.session.score}", True, DARK_BLUE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 250))
         self.screen.blit(score_text, score_rect)
         
         # Draw rounds played
-        rounds_text = self.normal_font.render(f"Countries guessed correctly: {self.rounds_played - 1}", True, BLACK)
+        rounds_text = render_text(self.normal_font, f"Countries guessed correctly: {self.session.rounds_played - 1}", True, BLACK)
         rounds_rect = rounds_text.get_rect(center=(SCREEN_WIDTH // 2, 320))
         self.screen.blit(rounds_text, rounds_rect)
         
-        # Draw play again button
-        play_again_button = Button(
-            SCREEN_WIDTH // 2 - 150,
-            400,
-            300, 60,
-            "Play Again",
-            GRAY, WHITE
-        )
-        play_again_button.draw(self.screen)
-        self.play_again_button = play_again_button
-        
-        # Draw main menu button
-        main_menu_button = Button(
-            SCREEN_WIDTH // 2 - 150,
-            480,
-            300, 60,
-            "Main Menu",
-            GRAY, WHITE
-        )
-        main_menu_button.draw(self.screen)
-        self.main_menu_button = main_menu_button
+        # Draw play again and main menu buttons
+        self.play_again_button.draw(self.screen)
+        self.main_menu_button.draw(self.screen)
+            
+    def active_buttons(self):
+        if self.state in ["main_menu", "language_menu", "score"]:
+            return self.buttons
+        elif self.state == "game":
+            return self.country_buttons
+        elif self.state == "game_over":
+            return [self.play_again_button, self.main_menu_button]
+        return []
+        
+    def handle_event(self, event, mouse_pos):
+        # Anything but pointer motion may change what the screen shows
+        if event.type != MOUSEMOTION:
+            self.needs_redraw = True
+            
+        if event.type == QUIT:
+            self.running = False
+            
+        if event.type == KEYDOWN and event.key == K_F3:
+            self.profiler.toggle()
+
+        # Handle custom events for timers
+        if event.type == USEREVENT + 1:  # Timer for next country after correct guess
+            pygame.time.set_timer(USEREVENT + 1, 0)  # Stop the timer
+            self.start_new_round()
+
+        if event.type == USEREVENT + 2:  # Timer for game over after 3 wrong tries
+            pygame.time.set_timer(USEREVENT + 2, 0)  # Stop the timer
+            self.state = "game_over"
+
+        # Handle mouse clicks
+        if event.type == MOUSEBUTTONDOWN:
+            if self.state == "main_menu":
+                for i, button in enumerate(self.buttons):
+                    if button.is_clicked(mouse_pos, event):
+                        if i == 0:  # Play Game
+                            self.new_game()
+                        elif i == 1:  # Change Language
+                            self.state = "language_menu"
+                            self.create_language_buttons()
+                        elif i == 2:  # View Score
+                            self.state = "score"
+                            self.buttons = []  # Will create back button in draw method
+                        elif i == 3:  # Exit Game
+                            self.running = False
+
+            elif self.state == "language_menu":
+                for i, button in enumerate(self.buttons):
+                    if button.is_clicked(mouse_pos, event):
+                        if i < len(LANGUAGES):  # Language selection
+                            self.language = list(LANGUAGES.values())[i]
+                            self.lang_data = self.localization.get(self.language)
+                            self.session.pack = self.lang_data
+                            self.create_main_menu_buttons()
+                            self.state = "main_menu"
+                        else:  # Back button
+                            self.state = "main_menu"
+                            self.create_main_menu_buttons()
+
+            elif self.state == "score":
+                for button in self.buttons:
+                    if button.is_clicked(mouse_pos, event):
+                        self.state = "main_menu"
+                        self.create_main_menu_buttons()
+
+            elif self.state == "game":
+                # Check country button clicks if no result message is showing
+                if not self.result_message:
+                    for button in self.country_buttons:
+                        if button.is_clicked(mouse_pos, event):
+                            self.check_guess(button.country_key)
+
+            elif self.state == "game_over":
+                if self.play_again_button.is_clicked(mouse_pos, event):
+                    self.new_game()
+                elif self.main_menu_button.is_clicked(mouse_pos, event):
+                    self.state = "main_menu"
+                    self.create_main_menu_buttons()
+            
+    def draw(self):
+        """Repaint what changed; return the dirty rects, or None after a full repaint."""
+        # The overlay refreshes continuously, so profiling repaints every frame
+        if not (self.needs_redraw or self.profiler.visible):
+            # Buttons are opaque, so a hover change only needs the button itself re-blitted
+            return [button.draw(self.screen) for button in self.active_buttons() if button.dirty]
+            
+        # Draw everything
+        self.screen.fill(self.bg_color)
+        
+        if self.state == "main_menu":
+            self.draw_main_menu()
+        elif self.state == "language_menu":
+            self.draw_language_menu()
+        elif self.state == "score":
+            self.draw_score_screen()
+        elif self.state == "game":
+            self.draw_game_screen()
+        elif self.state == "game_over":
+            self.draw_game_over_screen()
             
+        self.profiler.draw_overlay(self.screen, self.overlay_font, (SCREEN_WIDTH - 330, 10))
+        self.needs_redraw = False
+        return None
+        
     def run(self):
-        running = True
+        self.running = True
         
-        while running:
+        while self.running:
+            # The overlay refreshes continuously, so profiling falls back to polling
+            polling = not self.event_driven or self.profiler.visible
+            
+            # Block until something happens (input, window events or the round timers),
+            # unless a repaint is already pending
+            events = [] if polling or self.needs_redraw else [pygame.event.wait()]
+            
+            self.profiler.begin_frame()
             mouse_pos = pygame.mouse.get_pos()
             
             # Handle events
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    running = False
-                    
-                # Handle custom events for timers
-                if event.type == USEREVENT + 1:  # Timer for next country after correct guess
-                    pygame.time.set_timer(USEREVENT + 1, 0)  # Stop the timer
-                    self.start_new_round()
-                    
-                if event.type == USEREVENT + 2:  # Timer for game over after 3 wrong tries
-                    pygame.time.set_timer(USEREVENT + 2, 0)  # Stop the timer
-                    self.state = "game_over"
-                    
-                # Handle mouse clicks
-                if event.type == MOUSEBUTTONDOWN:
-                    if self.state == "main_menu":
-                        for i, button in enumerate(self.buttons):
-                            if button.is_clicked(mouse_pos, event):
-                                if i == 0:  # Play Game
-                                    self.state = "game"
-                                    self.game_over = False
-                                    self.score = 0
-                                    self.rounds_played = 0
-                                    self.total_time = 0
-                                    self.start_new_round()
-                                elif i == 1:  # Change Language
-                                    self.state = "language_menu"
-                                    self.create_language_buttons()
-                                elif i == 2:  # View Score
-                                    self.state = "score"
-                                    self.buttons = []  # Will create back button in draw method
-                                elif i == 3:  # Exit Game
-                                    running = False
-                                    
-                    elif self.state == "language_menu":
-                        for i, button in enumerate(self.buttons):
-                            if button.is_clicked(mouse_pos, event):
-                                if i < len(LANGUAGES):  # Language selection
-                                    self.language = list(LANGUAGES.values())[i]
-                                    self.lang_data = load_language_data(self.language)
-                                    self.create_main_menu_buttons()
-                                    self.state = "main_menu"
-                                else:  # Back button
-                                    self.state = "main_menu"
-                                    self.create_main_menu_buttons()
-                                    
-                    elif self.state == "score":
-                        for button in self.buttons:
-                            if button.is_clicked(mouse_pos, event):
-                                self.state = "main_menu"
-                                self.create_main_menu_buttons()
-                                
-                    elif self.state == "game":
-                        # Check country button clicks if no result message is showing
-                        if not self.result_message:
-                            for button in self.country_buttons:
-                                if button.is_clicked(mouse_pos, event):
-                                    self.check_guess(button.country_key)
-                                    
-                    elif self.state == "game_over":
-                        if hasattr(self, 'play_again_button') and self.play_again_button.is_clicked(mouse_pos, event):
-                            self.state = "game"
-                            self.game_over = False
-                            self.score = 0
-                            self.rounds_played = 0
-                            self.total_time = 0
-                            self.start_new_round()
-                        elif hasattr(self, 'main_menu_button') and self.main_menu_button.is_clicked(mouse_pos, event):
-                            self.state = "main_menu"
-                            self.create_main_menu_buttons()
+            with self.profiler.phase("events"):
+                for event in events + pygame.event.get():
+                    self.handle_event(event, mouse_pos)
             
             # Update button hover states
-            if self.state in ["main_menu", "language_menu", "score"]:
-                for button in self.buttons:
+            with self.profiler.phase("update"):
+                for button in self.active_buttons():
                     button.check_hover(mouse_pos)
-            elif self.state == "game":
-                for button in self.country_buttons:
-                    button.check_hover(mouse_pos)
-            elif self.state == "game_over":
-                if hasattr(self, 'play_again_button'):
-                    self.play_again_button.check_hover(mouse_pos)
-                if hasattr(self, 'main_menu_button'):
-                    self.main_menu_button.check_hover(mouse_pos)
             
-            # Draw everything
-            self.screen.fill(self.bg_color)
-            
-            if self.state == "main_menu":
-                self.draw_main_menu()
-            elif self.state == "language_menu":
-                self.draw_language_menu()
-            elif self.state == "score":
-                self.draw_score_screen()
-            elif self.state == "game":
-                self.draw_game_screen()
-            elif self.state == "game_over":
-                self.draw_game_over_screen()
+            with self.profiler.phase("draw"):
+                dirty = self.draw()
                 
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            with self.profiler.phase("flip"):
+                if dirty is None:
+                    pygame.display.flip()
+                elif dirty:
+                    pygame.display.update(dirty)
+            if polling:
+                with self.profiler.phase("wait"):
+                    self.clock.tick(FPS)
+            self.profiler.end_frame(buttons=len(self.buttons) + len(self.country_buttons),
+                                    text_cache=len(text_cache.entries))
             
+        if self.profile_out:
+            self.profiler.export(self.profile_out)
+        self.flags.shutdown()
         pygame.quit()
         sys.exit()
 
@@ -603,5 +694,9 @@ if not os.path.exists("flags"):
 
 # Run the game
 if __name__ == "__main__":
-    game = CountryPuzzleGame()
+    parser = argparse.ArgumentParser(description="Country Puzzle Game")
+    parser.add_argument("--profile-out", help="write per-frame timings to this .json or .csv file on exit")
+    parser.add_argument("--poll", action="store_true", help="redraw at a fixed FPS instead of waiting for events")
+    args = parser.parse_args()
+    game = CountryPuzzleGame(profile_out=args.profile_out, event_driven=not args.poll)
     game.run()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Frame-time instrumentation for the pygame games.
+Times named phases of each frame (events, update, collision, draw, flip and
+the wait on the frame clock), keeps rolling percentiles, shows them as a
+toggleable overlay and can dump every frame of a session to JSON or CSV.
+"""
+
+import csv
+import json
+import sys
+import time
+from collections import deque
+
+import pygame
+
+from percentiles import percentile
+
+PHASES = ("events", "update", "collision", "draw", "flip", "wait")
+OVERLAY_REFRESH_FRAMES = 15  # Re-render the overlay text a few times per second
+
+class PhaseTimer:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        phases = self.profiler.current
+        phases[self.name] = phases.get(self.name, 0.0) + elapsed
+        return False
+
+class NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_TIMER = NullTimer()
+
+class FrameProfiler:
+    def __init__(self, enabled=True, window=600, record=False):
+        self.enabled = enabled
+        self.record = record          # Keep every frame for export
+        self.visible = False          # Overlay toggle
+        self.frame_times = deque(maxlen=window)
+        self.phase_times = {name: deque(maxlen=window) for name in PHASES}
+        self.records = []
+        self.frames = 0
+        self.current = {}
+        self.frame_start = 0.0
+        self.blocks_start = 0
+        self.counts = {}
+        self.overlay = None
+        self.overlay_rect = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+        self.blocks_start = sys.getallocatedblocks()
+
+    def phase(self, name):
+        return PhaseTimer(self, name) if self.enabled else NULL_TIMER
+
+    def end_frame(self, **counts):
+        """Close the frame; counts are extra gauges such as sprite totals."""
+        if not self.enabled:
+            return
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.frames += 1
+        self.frame_times.append(frame_ms)
+        for name in self.current:
+            self.phase_times.setdefault(name, deque(maxlen=self.frame_times.maxlen)).append(self.current[name])
+        self.counts = dict(counts, allocated_blocks=sys.getallocatedblocks() - self.blocks_start)
+
+        if self.record:
+            row = {"frame": self.frames, "frame_ms": round(frame_ms, 3)}
+            for name in PHASES:
+                row[f"{name}_ms"] = round(self.current.get(name, 0.0), 3)
+            row.update(self.counts)
+            self.records.append(row)
+
+    def summary(self):
+        frames = list(self.frame_times)
+        return {
+            "frames": self.frames,
+            "p50_ms": percentile(frames, 0.50),
+            "p95_ms": percentile(frames, 0.95),
+            "p99_ms": percentile(frames, 0.99),
+            "phase_avg_ms": {name: sum(times) / len(times)
+                             for name, times in self.phase_times.items() if times},
+            "counts": self.counts,
+        }
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.overlay = None
+
+    def draw_overlay(self, surface, font, pos=(10, 10)):
+        """Blit the overlay if visible; return the rect it covers, or None."""
+        if not (self.enabled and self.visible):
+            return None
+        if self.overlay is None or self.frames % OVERLAY_REFRESH_FRAMES == 0:
+            self.overlay = self.render_overlay(font)
+        self.overlay_rect = surface.blit(self.overlay, pos)
+        return self.overlay_rect
+
+    def render_overlay(self, font):
+        stats = self.summary()
+        lines = [f"frame p50 {stats['p50_ms']:.2f}  p95 {stats['p95_ms']:.2f}  p99 {stats['p99_ms']:.2f} ms"]
+        lines += [f"{name:<10}{ms:6.2f} ms" for name, ms in stats["phase_avg_ms"].items()]
+        lines += [f"{name:<10}{value}" for name, value in stats["counts"].items()]
+
+        rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 10
+        height = sum(text.get_height() for text in rendered) + 10
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        y = 5
+        for text in rendered:
+            overlay.blit(text, (5, y))
+            y += text.get_height()
+        return overlay
+
+    def export(self, path):
+        """Write the recorded frames to path as CSV (.csv) or JSON (anything else)."""
+        if path.endswith(".csv"):
+            fields = []
+            for row in self.records:
+                for key in row:
+                    if key not in fields:
+                        fields.append(key)
+            with open(path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.DictWriter(file, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(self.records)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"summary": self.summary(), "frames": self.records}, file, indent=2)
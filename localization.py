@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lazily loaded language packs for the country puzzle games.
+A pack bundles a language's UI strings with its country names, hints and
+info from the country catalog. Packs are loaded the first time a language
+is shown and kept in a small LRU, so switching back and forth costs
+nothing and unused languages are dropped as more are added.
+The fallback chain (e.g. "pt-BR" -> "pt" -> "en") is resolved once when a
+pack is loaded: missing UI strings are filled in from the fallbacks, so
+lookups never go through exception handlers.
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+FALLBACK_LANGUAGE = "en"
+STRINGS_PATH = "language_data_{}.json"
+
+def fallback_chain(code, fallback=FALLBACK_LANGUAGE):
+    """Languages to consult for code, most specific first."""
+    chain = [code]
+    while "-" in chain[-1]:
+        chain.append(chain[-1].rsplit("-", 1)[0])
+    if fallback not in chain:
+        chain.append(fallback)
+    return chain
+
+class LanguagePack:
+    def __init__(self, code, strings, countries, country_language):
+        self.code = code
+        self.strings = strings                    # UI strings, fallbacks already merged in
+        self.countries = countries
+        self.country_language = country_language  # Catalog language the country text comes from
+        self.table = countries.language(country_language)
+
+    def __getitem__(self, name):
+        return self.strings[name]
+
+    def __contains__(self, name):
+        return name in self.strings
+
+    def get(self, name, default=None):
+        return self.strings.get(name, default)
+
+    def name(self, key):
+        return self.table.name(self.countries.index[key])
+
+    def hints(self, key):
+        return self.table.hints(self.countries.index[key])
+
+    def info(self, key):
+        return self.table.info(self.countries.index[key])
+
+class Localization:
+    def __init__(self, countries, max_loaded=4, fallback=FALLBACK_LANGUAGE, strings_path=STRINGS_PATH):
+        self.countries = countries
+        self.max_loaded = max_loaded
+        self.fallback = fallback
+        self.strings_path = strings_path
+        self.packs = OrderedDict()  # code -> LanguagePack, in LRU order
+        self.raw = {}               # code -> parsed UI strings, or None if there is no file
+
+    def read_strings(self, code):
+        if code not in self.raw:
+            path = self.strings_path.format(code)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as file:
+                    self.raw[code] = json.load(file)
+            else:
+                self.raw[code] = None
+        return self.raw[code]
+
+    def load(self, code):
+        chain = fallback_chain(code, self.fallback)
+        strings = {}
+        for language in reversed(chain):
+            strings.update(self.read_strings(language) or {})
+        if self.raw[code] is None:
+            found = [language for language in chain[1:] if self.raw[language] is not None]
+            if found:
+                print(f"Language data for {code} not found. Defaulting to {found[0]}.")
+            else:
+                print(f"Language data for {code} not found.")
+        country_language = next(language for language in chain
+                                if language in self.countries.languages or language == self.fallback)
+        return LanguagePack(code, strings, self.countries, country_language)
+
+    def get(self, code):
+        """Return the pack for code, loading it on first use."""
+        pack = self.packs.get(code)
+        if pack is not None:
+            self.packs.move_to_end(code)
+            return pack
+
+        pack = self.load(code)
+        self.packs[code] = pack
+        if len(self.packs) > self.max_loaded:
+            self.evict(next(iter(self.packs)))
+        return pack
+
+    def evict(self, code):
+        pack = self.packs.pop(code)
+        # Only the fallback's strings and those of chains still loaded stay parsed
+        in_use = {self.fallback}
+        for other in self.packs:
+            in_use.update(fallback_chain(other, self.fallback))
+        for language in fallback_chain(code, self.fallback):
+            if language not in in_use:
+                self.raw.pop(language, None)
+        if all(other.country_language != pack.country_language for other in self.packs.values()):
+            self.countries.release(pack.country_language)
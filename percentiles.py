@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Percentile helper shared by the frame profiler and the quiz benchmark.
+Kept free of pygame so the engine and server tools can use it without a
+display stack.
+"""
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an unsorted sequence."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Round logic of the country puzzle, free of any I/O.
+A QuizSession samples the options, tracks hint progression, tries and
+score, and reports what happened on each guess; the caller decides how to
+show it and when to start the next round. Time comes from an injectable
+clock, so the same session runs behind input(), a pygame window or a
+network connection.
+"""
+
+import random
+import time
+
+MAX_TRIES = 3
+OPTION_COUNT = 5
+NEXT_ROUND_DELAY = 3  # Seconds the answer stays up before the next round
+
+def score_guess(hint_index, hint_count, time_taken):
+    """Points for a correct guess: more for fewer hints and faster guessing."""
+    hint_factor = (hint_count - hint_index) / hint_count
+    time_factor = max(0, 1 - (time_taken / 60))  # Time factor decreases as time increases
+    return int((hint_factor * 70 + time_factor * 30) * 10)
+
+class GuessResult:
+    def __init__(self, correct, points, time_taken, new_hint=False, game_over=False):
+        self.correct = correct
+        self.points = points
+        self.time_taken = time_taken
+        self.new_hint = new_hint    # A wrong guess revealed the next hint
+        self.game_over = game_over  # The last try was used up
+
+class QuizSession:
+    def __init__(self, countries, pack, rng=random, clock=time.monotonic,
+                 option_count=OPTION_COUNT, max_tries=MAX_TRIES):
+        self.countries = countries
+        self.pack = pack  # LanguagePack the hints come from
+        self.rng = rng
+        self.clock = clock
+        self.option_count = option_count
+        self.max_tries = max_tries
+        self.reset()
+
+    def reset(self):
+        self.score = 0
+        self.total_time = 0
+        self.rounds_played = 0
+        self.game_over = False
+        self.tries_remaining = self.max_tries
+        self.options = []
+        self.correct_country = None
+        self.hint_index = 0
+        self.start_time = 0
+        self.round_active = False
+
+    @property
+    def hints(self):
+        return self.pack.hints(self.correct_country)
+
+    @property
+    def hint(self):
+        return self.hints[self.hint_index]
+
+    def sample(self):
+        return self.countries.sample(self.option_count, self.rng)
+
+    def new_round(self, options=None):
+        """Start a round, with pre-sampled options if given; return the options."""
+        self.options = list(options) if options else self.sample()
+        self.correct_country = self.rng.choice(self.options)
+        self.hint_index = 0
+        self.tries_remaining = self.max_tries
+        self.start_time = self.clock()
+        self.round_active = True
+        return self.options
+
+    def guess(self, country_key):
+        if not self.round_active:
+            raise ValueError("No round in progress")
+        if country_key not in self.options:
+            raise ValueError(f"{country_key!r} is not one of this round's options")
+        time_taken = self.clock() - self.start_time
+
+        if country_key == self.correct_country:
+            points = score_guess(self.hint_index, len(self.hints), time_taken)
+            self.score += points
+            self.total_time += time_taken
+            self.rounds_played += 1
+            self.round_active = False
+            return GuessResult(True, points, time_taken)
+
+        self.tries_remaining -= 1
+        if self.tries_remaining > 0:
+            # Show the next hint if one is left
+            if self.hint_index < len(self.hints) - 1:
+                self.hint_index += 1
+                return GuessResult(False, 0, time_taken, new_hint=True)
+            return GuessResult(False, 0, time_taken)
+
+        # Game over after the last wrong try
+        self.rounds_played += 1
+        self.game_over = True
+        self.round_active = False
+        return GuessResult(False, 0, time_taken, game_over=True)
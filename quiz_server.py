@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Multi-session country puzzle server.
+One asyncio process serves any number of players over plain TCP. Each
+connection gets its own QuizSession; the country catalog and language
+packs are shared. The pause between rounds is a loop timer, not a sleep,
+so a waiting player costs nothing.
+
+Protocol: one JSON object per line in each direction.
+    -> {"op": "start", "language": "hi"}   start (or restart) a game
+    -> {"op": "guess", "country": "india"}
+    -> {"op": "language", "language": "gu"}
+    -> {"op": "score"}
+    -> {"op": "quit"}
+    <- {"type": "round" | "hint" | "result" | "game_over" | "score" | "error", ...}
+
+Try it with: python quiz_server.py --port 8765, then nc localhost 8765.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+
+from country_catalog import load_catalog
+from localization import Localization
+from quiz_engine import NEXT_ROUND_DELAY, QuizSession
+
+MAX_LINE = 4096
+
+class PlayerConnection:
+    def __init__(self, server, reader, writer):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.session = None
+        self.next_round = None  # TimerHandle of the pending round start
+
+    def send(self, message):
+        self.writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def round_message(self):
+        session = self.session
+        pack = session.pack
+        return {
+            "type": "round",
+            "round": session.rounds_played + 1,
+            "options": [{"country": key, "name": pack.name(key), "flag": self.server.countries.flag(key)}
+                        for key in session.options],
+            "hint": session.hint,
+            "hint_number": session.hint_index + 1,
+            "hint_count": len(session.hints),
+            "tries_remaining": session.tries_remaining,
+        }
+
+    def score_message(self):
+        session = self.session
+        return {"type": "score", "score": session.score, "rounds_played": session.rounds_played,
+                "total_time": round(session.total_time, 3)}
+
+    def start_round(self):
+        self.next_round = None
+        self.session.new_round()
+        self.send(self.round_message())
+
+    def cancel_timer(self):
+        if self.next_round is not None:
+            self.next_round.cancel()
+            self.next_round = None
+
+    def requested_pack(self, request):
+        """Pack for the request's language, or None after replying with an error."""
+        language = request.get("language", "en")
+        if not isinstance(language, str) or language not in self.server.countries.languages:
+            self.send({"type": "error", "error": "invalid_language"})
+            return None
+        return self.server.localization.get(language)
+
+    def handle_start(self, request):
+        pack = self.requested_pack(request)
+        if pack is None:
+            return
+        self.cancel_timer()
+        if self.session is None:
+            self.session = QuizSession(self.server.countries, pack, self.server.rng)
+        else:
+            self.session.pack = pack
+            self.session.reset()
+        self.start_round()
+
+    def handle_guess(self, request):
+        session = self.session
+        if session is None or not session.round_active:
+            self.send({"type": "error", "error": "no_round"})
+            return
+        country = request.get("country")
+        if country not in session.options:
+            self.send({"type": "error", "error": "invalid_choice"})
+            return
+
+        correct_country = session.correct_country
+        result = session.guess(country)
+        pack = session.pack
+        if result.correct:
+            self.send({"type": "result", "correct": True, "points": result.points,
+                       "time_taken": round(result.time_taken, 3), "score": session.score,
+                       "country": correct_country, "name": pack.name(correct_country),
+                       "info": list(pack.info(correct_country)), "next_round_in": self.server.round_delay})
+            self.next_round = asyncio.get_running_loop().call_later(self.server.round_delay, self.start_round)
+        elif result.game_over:
+            self.send({"type": "game_over", "country": correct_country, "name": pack.name(correct_country),
+                       "score": session.score, "rounds_played": session.rounds_played})
+        else:
+            message = {"type": "hint", "correct": False, "tries_remaining": session.tries_remaining}
+            if result.new_hint:
+                message.update(hint=session.hint, hint_number=session.hint_index + 1)
+            self.send(message)
+
+    def handle_language(self, request):
+        pack = self.requested_pack(request)
+        if pack is None:
+            return
+        if self.session is not None:
+            self.session.pack = pack
+            if self.session.round_active:
+                self.send(self.round_message())
+                return
+        self.send({"type": "language", "language": pack.code})
+
+    def handle(self, request):
+        op = request.get("op")
+        if op == "start":
+            self.handle_start(request)
+        elif op == "guess":
+            self.handle_guess(request)
+        elif op == "language":
+            self.handle_language(request)
+        elif op == "score":
+            if self.session is None:
+                self.send({"type": "error", "error": "no_game"})
+            else:
+                self.send(self.score_message())
+        elif op == "quit":
+            return False
+        else:
+            self.send({"type": "error", "error": "unknown_op"})
+        return True
+
+    async def serve(self):
+        try:
+            while True:
+                try:
+                    line = await self.reader.readline()
+                except ValueError:  # Line longer than MAX_LINE
+                    self.send({"type": "error", "error": "line_too_long"})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self.send({"type": "error", "error": "invalid_json"})
+                    continue
+                if not isinstance(request, dict):
+                    self.send({"type": "error", "error": "invalid_request"})
+                    continue
+                if not self.handle(request):
+                    break
+                await self.writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.cancel_timer()
+            self.writer.close()
+
+class QuizServer:
+    def __init__(self, countries, round_delay=NEXT_ROUND_DELAY, seed=None):
+        self.countries = countries
+        self.localization = Localization(countries)
+        self.round_delay = round_delay
+        self.rng = random.Random(seed)
+        self.connections = set()
+
+    async def handle_connection(self, reader, writer):
+        connection = PlayerConnection(self, reader, writer)
+        self.connections.add(connection)
+        try:
+            await connection.serve()
+        finally:
+            self.connections.discard(connection)
+
+    async def start(self, host="127.0.0.1", port=8765):
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+
+async def serve(host, port, round_delay, seed):
+    try:
+        countries = load_catalog("country_data.json")
+    except FileNotFoundError:
+        raise SystemExit("Country data file not found.")
+    server = await QuizServer(countries, round_delay, seed).start(host, port)
+    print(f"Serving the country puzzle on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the country puzzle to many players over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--round-delay", type=float, default=NEXT_ROUND_DELAY,
+                        help="seconds between a correct answer and the next round")
+    parser.add_argument("--seed", type=int, help="seed the shared RNG for reproducible rounds")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.round_delay, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
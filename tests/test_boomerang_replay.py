@@ -0,0 +1,79 @@
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from pygame.locals import K_LEFT, K_RIGHT, K_SPACE
+
+from boomerang_dodge import (FixedStepClock, Game, ReplayInput, ScriptedInput, keys_to_bits, play_replay,
+                             simulate)
+from boomerang_replay import Replay, ReplayRecorder
+
+def random_script(seed, ticks):
+    """Key sets held for random stretches, like a player would."""
+    rng = random.Random(seed)
+    script = []
+    while len(script) < ticks:
+        keys = {key for key in (K_LEFT, K_RIGHT, K_SPACE) if rng.random() < 0.4}
+        script.extend([keys] * rng.randint(1, 300))
+    return script[:ticks]
+
+def test_recorder_round_trip():
+    rng = random.Random(1)
+    recorder = ReplayRecorder(123456789, 1000 / 60)
+    recorded = []
+    for _ in range(50):
+        bits = rng.randrange(16)
+        for _ in range(rng.choice((1, 5, 127, 128, 20000))):
+            recorder.record(bits)
+            recorded.append(bits)
+
+    replay = Replay.from_bytes(recorder.to_bytes())
+    assert replay.seed == 123456789
+    assert replay.step_ms == 1000 / 60
+    assert replay.ticks == len(recorded)
+    assert list(replay.inputs()) == recorded
+
+def test_damaged_replays_raise_value_error():
+    recorder = ReplayRecorder(7, 1000 / 60)
+    for bits in [1] * 300 + [2] * 5:
+        recorder.record(bits)
+    data = recorder.to_bytes()
+    for end in range(len(data)):
+        with pytest.raises(ValueError):
+            Replay.from_bytes(data[:end])
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b"XXXX" + data[4:])
+
+def trace(game, ticks):
+    """Player and boomerang positions after every tick."""
+    states = []
+    for _ in range(ticks):
+        game.step()
+        states.append((game.state, game.player.rect.topleft,
+                       sorted(boomerang.rect.center for boomerang in game.boomerangs)))
+    return states
+
+def test_replay_matches_the_recorded_game_tick_for_tick():
+    script = random_script(3, 2000)
+    game = Game(clock=FixedStepClock(), seed=3, controller=ScriptedInput(script), headless=True, record=True)
+    original = trace(game, len(script))
+    assert game.recorder.ticks == len(script)
+    assert list(Replay.from_bytes(game.recorder.to_bytes()).inputs()) == [keys_to_bits(keys) for keys in script]
+
+    replay = Replay.from_bytes(game.recorder.to_bytes())
+    replayed = Game(clock=FixedStepClock(replay.step_ms), seed=replay.seed, controller=ReplayInput(replay),
+                    headless=True)
+    assert trace(replayed, replay.ticks) == original
+
+def test_play_replay_reproduces_simulate(tmp_path):
+    for seed in range(3):
+        path = str(tmp_path / f"game{seed}.bdr")
+        result = simulate(seed=seed, controller=ScriptedInput(random_script(seed, 5000)), max_steps=5000,
+                          record=path)
+        replayed = play_replay(path)
+        for field in ("seed", "score", "level", "steps", "game_over"):
+            assert replayed[field] == result[field], (seed, field)
@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+
+from country_catalog import CountryCatalog, build, compile_catalog, language_path, load_catalog
+
+COUNTRY_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "country_data.json")
+
+def load_country_data():
+    with open(COUNTRY_DATA, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+def check_catalog(catalog, countries):
+    assert list(catalog) == list(countries)
+    assert set(catalog.languages) == {"en", "hi", "gu"}
+    for key, country in countries.items():
+        assert catalog.flag(key) == country["flag"]
+        for language in catalog.languages:
+            assert catalog.name(key, language) == country["names"][language]
+            assert catalog.hints(key, language) == tuple(country["hints"][language])
+            assert catalog.info(key, language) == tuple(country["info"][language])
+
+def test_compiled_catalog_returns_every_string():
+    countries = load_country_data()
+    core, languages = compile_catalog(countries)
+    check_catalog(CountryCatalog(core, languages.__getitem__), countries)
+
+def test_built_files_return_every_string(tmp_path):
+    countries = load_country_data()
+    base = str(tmp_path / "countries")
+    build(COUNTRY_DATA, base)
+    check_catalog(CountryCatalog.open(base), countries)
+
+def test_missing_languages_fall_back_to_english():
+    countries = {
+        "atlantis": {"names": {"en": "Atlantis", "hi": "अटलांटिस"}, "flag": "flags/atlantis.png",
+                     "hints": {"en": ["Sunk", "Wet"], "hi": ["डूबा हुआ"]}, "info": {"en": ["Legendary"]}},
+        "lemuria": {"names": {"en": "Lemuria"}, "flag": "flags/lemuria.png",
+                    "hints": {"en": ["Lost"]}, "info": {"en": ["Also legendary"]}},
+    }
+    catalog = CountryCatalog.from_dict(countries)
+    assert catalog.languages == ("en", "hi")
+    assert catalog.name("atlantis", "hi") == "अटलांटिस"
+    assert catalog.hints("atlantis", "hi") == ("डूबा हुआ",)
+    assert catalog.info("atlantis", "hi") == ("Legendary",)
+    assert catalog.name("lemuria", "hi") == "Lemuria"
+    assert catalog.hints("lemuria", "hi") == ("Lost",)
+    with pytest.raises(KeyError):
+        catalog.language("gu")
+
+def test_load_catalog_recompiles_when_a_language_file_is_missing_or_stale(tmp_path):
+    json_path = str(tmp_path / "countries.json")
+    base = str(tmp_path / "countries")
+    countries = load_country_data()
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump(countries, file, ensure_ascii=False)
+    build(json_path, base)
+    check_catalog(load_catalog(json_path, base), countries)
+
+    os.remove(language_path(base, "gu"))
+    check_catalog(load_catalog(json_path, base), countries)
+
+    build(json_path, base)
+    mtime = os.path.getmtime(json_path)
+    os.utime(language_path(base, "hi"), (mtime - 10, mtime - 10))
+    check_catalog(load_catalog(json_path, base), countries)
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from country_catalog import CountryCatalog
+from quiz_engine import MAX_TRIES, QuizSession, score_guess
+
+COUNTRIES = {
+    f"country_{i}": {"names": {"en": f"Country {i}"}, "flag": f"flags/{i}.png",
+                     "hints": {"en": [f"Hint {j} for {i}" for j in range(i % 3 + 1)]}, "info": {"en": [f"Info {i}"]}}
+    for i in range(8)
+}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+class Pack:
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def hints(self, key):
+        return self.catalog.hints(key, "en")
+
+def make_session(seed=0):
+    catalog = CountryCatalog.from_dict(COUNTRIES)
+    clock = FakeClock()
+    return QuizSession(catalog, Pack(catalog), random.Random(seed), clock), clock
+
+def wrong_option(session):
+    return next(key for key in session.options if key != session.correct_country)
+
+def test_score_guess():
+    assert score_guess(0, 3, 0) == 1000
+    assert score_guess(2, 3, 0) == 533
+    assert score_guess(0, 3, 30) == 850
+    assert score_guess(0, 3, 120) == 700
+    assert score_guess(1, 2, 60) == 350
+
+def test_correct_guess_scores_and_ends_the_round():
+    session, clock = make_session()
+    options = session.new_round()
+    assert len(options) == 5 and session.correct_country in options
+    assert session.tries_remaining == MAX_TRIES and session.hint_index == 0
+
+    clock.now += 12
+    result = session.guess(session.correct_country)
+    assert result.correct and not result.game_over
+    assert result.time_taken == 12
+    assert result.points == score_guess(0, len(session.hints), 12)
+    assert session.score == result.points
+    assert session.total_time == 12
+    assert session.rounds_played == 1
+    assert not session.round_active
+
+def test_wrong_guesses_reveal_hints_then_end_the_game():
+    for seed in range(20):
+        session, clock = make_session(seed)
+        session.new_round()
+        hint_count = len(session.hints)
+        for attempt in range(1, MAX_TRIES):
+            result = session.guess(wrong_option(session))
+            assert not result.correct and not result.game_over and result.points == 0
+            assert session.tries_remaining == MAX_TRIES - attempt
+            assert result.new_hint == (attempt < hint_count)
+            assert session.hint_index == min(attempt, hint_count - 1)
+            assert session.round_active
+
+        result = session.guess(wrong_option(session))
+        assert result.game_over and not result.correct
+        assert session.game_over and not session.round_active
+        assert session.rounds_played == 1 and session.score == 0
+
+def test_a_correct_guess_after_hints_scores_less():
+    session, clock = make_session(3)
+    while True:
+        session.new_round()
+        if len(session.hints) == 3:
+            break
+    session.guess(wrong_option(session))
+    result = session.guess(session.correct_country)
+    assert result.correct
+    assert result.points == score_guess(1, 3, 0)
+    assert session.tries_remaining == MAX_TRIES - 1
+
+def test_guesses_outside_a_round_are_rejected():
+    session, clock = make_session()
+    with pytest.raises(ValueError):
+        session.guess("country_0")
+    session.new_round()
+    with pytest.raises(ValueError):
+        session.guess("atlantis")
+    session.guess(session.correct_country)
+    with pytest.raises(ValueError):
+        session.guess(session.options[0])
+
+def test_reset_starts_a_new_game():
+    session, clock = make_session()
+    session.new_round()
+    for _ in range(MAX_TRIES):
+        session.guess(wrong_option(session))
+    assert session.game_over
+    session.reset()
+    assert not session.game_over
+    assert (session.score, session.rounds_played, session.total_time) == (0, 0, 0)
@@ -0,0 +1,57 @@
+from tic_tac_toe_ai import WIN_SCORE, Solver
+from tic_tac_toe_engine import Board
+
+def minimax(board, memo):
+    """Plain minimax value for the player to move, scored like the solver."""
+    key = tuple(board.bits)
+    if key not in memo:
+        if board.moves and board.last_player_won():
+            memo[key] = -(WIN_SCORE - len(board.moves))
+        elif board.is_full():
+            memo[key] = 0
+        else:
+            values = []
+            for cell in board.legal_moves():
+                board.play(cell)
+                values.append(-minimax(board, memo))
+                board.undo()
+            memo[key] = max(values)
+    return memo[key]
+
+def reachable_positions():
+    """Every distinct non-terminal position reachable from the empty board."""
+    seen = set()
+    frontier = [Board()]
+    while frontier:
+        board = frontier.pop()
+        key = tuple(board.bits)
+        if key in seen or (board.moves and board.last_player_won()) or board.is_full():
+            continue
+        seen.add(key)
+        yield board
+        for cell in board.legal_moves():
+            child = Board.from_bits(*board.bits)
+            child.play(cell)
+            frontier.append(child)
+
+def check_optimal(solver):
+    memo = {}
+    positions = 0
+    for board in reachable_positions():
+        cell = solver.best_move(board)
+        assert board.is_empty(cell)
+        board.play(cell)
+        chosen = -minimax(board, memo)
+        board.undo()
+        assert chosen == minimax(board, memo), board.to_rows()
+        positions += 1
+    assert positions == 4520
+
+def test_book_plays_optimally_everywhere():
+    solver = Solver()
+    solver.build_book()
+    assert len(solver.book) == 627
+    check_optimal(solver)
+
+def test_search_plays_optimally_everywhere():
+    check_optimal(Solver())
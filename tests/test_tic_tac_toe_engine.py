@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from tic_tac_toe import check_winner
+from tic_tac_toe_engine import CELLS, DIRECTIONS, SIZE, WINNING, Board, MNKBoard, new_board
+
+def scan_winner(rows, player):
+    """The original row, column and diagonal scan."""
+    for i in range(SIZE):
+        if all(rows[i][j] == player for j in range(SIZE)):
+            return True
+        if all(rows[j][i] == player for j in range(SIZE)):
+            return True
+    if all(rows[i][i] == player for i in range(SIZE)):
+        return True
+    return all(rows[i][SIZE - 1 - i] == player for i in range(SIZE))
+
+def test_winning_table_matches_scan_on_all_boards():
+    for bits in range(1 << CELLS):
+        rows = Board.from_bits(bits, 0).to_rows()
+        expected = scan_winner(rows, "X")
+        assert bool(WINNING[bits]) == expected, bits
+        assert check_winner(rows, "X") == expected, bits
+
+def scan_mnk_winner(board, player):
+    """Brute force: look for k in a row starting from every stone of player."""
+    for cell, owner in board.stones.items():
+        if owner != player:
+            continue
+        row, col = divmod(cell, board.cols)
+        for d_row, d_col in DIRECTIONS:
+            cells = [(row + d_row * i, col + d_col * i) for i in range(board.k)]
+            if all(0 <= r < board.rows and 0 <= c < board.cols and board.stones.get(r * board.cols + c) == player
+                   for r, c in cells):
+                return True
+    return False
+
+def test_mnk_last_move_check_matches_scan():
+    rng = random.Random(0)
+    for game in range(300):
+        rows, cols = rng.choice((3, 6, 15)), rng.choice((3, 7, 15))
+        board = MNKBoard(rows, cols, rng.choice([k for k in (3, 4, 5) if k <= max(rows, cols)]))
+        moves = board.legal_moves()
+        rng.shuffle(moves)
+        for cell in moves:
+            board.play(cell)
+            won = scan_mnk_winner(board, board.player ^ 1)
+            assert board.last_player_won() == won, (game, board.moves)
+            if won:
+                break
+
+def test_mnk_rejects_impossible_boards():
+    for rows, cols, k in ((0, 0, 3), (3, 3, 0), (3, 4, 5), (-1, 5, 3)):
+        with pytest.raises(ValueError):
+            new_board(rows, cols, k)
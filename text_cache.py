@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared fonts and rendered text surfaces for the pygame games.
+System font lookups go through fontconfig and rendering the same string
+every frame is wasted work, so fonts are registered once per
+(family, size, bold) and surfaces are kept in a small LRU keyed by
+everything that affects the pixels.
+Cached surfaces are shared: callers must blit them, never draw onto them.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# Process-wide font registry keyed by (family, size, bold)
+fonts = {}
+
+def get_font(family, size, bold=False):
+    key = (family, size, bold)
+    font = fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(family, size, bold=bold)
+        fonts[key] = font
+    return font
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Return the surface for font.render(text, antialias, color, background)."""
+        key = (font, text, antialias, tuple(color), tuple(background) if background else None)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Evict the least recently used
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+# Process-wide cache shared by all games and widgets
+text_cache = TextCache()
+
+def render_text(font, text, antialias, color, background=None):
+    return text_cache.render(font, text, antialias, color, background)
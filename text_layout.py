@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cached word wrapping for the pygame games.
+Words are measured once per font, wrapped lines are cached per
+(text, font, width, language) and line surfaces come from the shared
+text cache, so static paragraphs cost nothing to redraw.
+Words wider than a line are broken between grapheme clusters, never inside
+one, so Devanagari and Gujarati vowel signs and conjuncts stay together.
+"""
+
+import unicodedata
+from collections import OrderedDict
+
+from text_cache import render_text
+
+ZERO_WIDTH_JOINERS = ("\u200c", "\u200d")
+VIRAMA_COMBINING_CLASS = 9
+MAX_WORD_WIDTHS = 4096
+
+def grapheme_clusters(text):
+    """Split text into user-perceived characters (simplified extended grapheme clusters)."""
+    clusters = []
+    for char in text:
+        if clusters and (
+            unicodedata.category(char) in ("Mn", "Mc", "Me")
+            or char in ZERO_WIDTH_JOINERS
+            or clusters[-1][-1] in ZERO_WIDTH_JOINERS
+            or unicodedata.combining(clusters[-1][-1]) == VIRAMA_COMBINING_CLASS
+        ):
+            # Marks, joiners and the consonant after a virama belong to the previous cluster
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+    return clusters
+
+class TextLayout:
+    def __init__(self, max_layouts=128):
+        self.max_layouts = max_layouts
+        self.word_widths = {}        # (font, word) -> pixel width
+        self.layouts = OrderedDict() # (text, font, width, language) -> wrapped lines, in LRU order
+
+    def measure(self, font, word):
+        key = (font, word)
+        width = self.word_widths.get(key)
+        if width is None:
+            if len(self.word_widths) >= MAX_WORD_WIDTHS:
+                self.word_widths.clear()
+            width = font.size(word)[0]
+            self.word_widths[key] = width
+        return width
+
+    def split_word(self, font, word, max_width):
+        """Break an over-long word into pieces that fit, on grapheme cluster boundaries."""
+        pieces = []
+        piece = ""
+        for cluster in grapheme_clusters(word):
+            if piece and font.size(piece + cluster)[0] >= max_width:
+                pieces.append(piece)
+                piece = cluster
+            else:
+                piece += cluster
+        if piece:
+            pieces.append(piece)
+        return pieces
+
+    def wrap(self, font, text, max_width, language="en"):
+        """Return the lines of text wrapped to fit strictly inside max_width pixels."""
+        key = (text, font, max_width, language)
+        lines = self.layouts.get(key)
+        if lines is not None:
+            self.layouts.move_to_end(key)
+            return lines
+
+        space = self.measure(font, " ")
+        lines = []
+        line = []
+        line_width = 0
+        for word in text.split():
+            word_width = self.measure(font, word)
+            if word_width + space >= max_width:
+                pieces = self.split_word(font, word, max_width - space)
+            else:
+                pieces = [word]
+            for piece in pieces:
+                piece_width = word_width if len(pieces) == 1 else self.measure(font, piece)
+                if line and line_width + piece_width + space >= max_width:
+                    lines.append(" ".join(line))
+                    line = []
+                    line_width = 0
+                line.append(piece)
+                line_width += piece_width + space
+        if line:
+            lines.append(" ".join(line))
+
+        lines = tuple(lines)
+        self.layouts[key] = lines
+        if len(self.layouts) > self.max_layouts:
+            self.layouts.popitem(last=False)  # Evict the least recently used layout
+        return lines
+
+    def render(self, font, text, max_width, color, language="en"):
+        """Return one cached surface per wrapped line."""
+        return [render_text(font, line, True, color) for line in self.wrap(font, text, max_width, language)]
+
+# Process-wide layout cache
+text_layout = TextLayout()
@@ -1,66 +1,94 @@
 #!/usr/bin/env python3
 """
-A simple command-line Tic Tac Toe game for two players.
+A simple command-line Tic Tac Toe game for two players, or one player against
+a computer opponent (perfect play on 3x3, Monte Carlo tree search on larger boards).
 Players take turns entering their moves by specifying row and column coordinates.
+Larger boards with k-in-a-row rules are supported too, e.g. --rows 15 --cols 15 --k 5.
 """
 
+import argparse
+
+from tic_tac_toe_ai import BOOK_PATH, Solver
+from tic_tac_toe_engine import SIZE, WINNING, Board, bits_from_rows, check_size, new_board
+from tic_tac_toe_mcts import MCTSPlayer
+
+# Computer opponents, loaded on first use
+solver = None
+mcts_player = None
+
 def print_board(board):
     """Print the current state of the game board."""
     print("\n")
     for i, row in enumerate(board):
         print(" | ".join(cell if cell else " " for cell in row))
-        if i < 2:  # Don't print separator after the last row
-            print("-" * 9)
+        if i < len(board) - 1:  # Don't print separator after the last row
+            print("-" * (4 * len(row) - 3))
     print("\n")
 
 def check_winner(board, player):
     """Check if the specified player has won."""
-    # Check rows
-    for row in board:
-        if all(cell == player for cell in row):
-            return True
-    
-    # Check columns
-    for col in range(3):
-        if all(board[row][col] == player for row in range(3)):
-            return True
-    
-    # Check diagonals
-    if all(board[i][i] == player for i in range(3)) or all(board[i][2-i] == player for i in range(3)):
-        return True
-    
-    return False
+    return WINNING[bits_from_rows(board, player)] == 1
 
 def is_board_full(board):
     """Check if the board is full (tie game)."""
     return all(all(cell for cell in row) for row in board)
 
-def main():
-    """Main game function."""
-    # Initialize empty 3x3 board
-    board = [['' for _ in range(3)] for _ in range(3)]
-    current_player = 'X'
+def get_solver():
+    """Load the solved positions once per process."""
+    global solver
+    if solver is None:
+        solver = Solver.load(BOOK_PATH)
+    return solver
+
+def get_mcts_player(think_time, workers):
+    """Start the MCTS worker pool once per process."""
+    global mcts_player
+    if mcts_player is None:
+        mcts_player = MCTSPlayer(think_time, workers=workers)
+    return mcts_player
+
+def play_game(rows=SIZE, cols=SIZE, k=SIZE, think_time=2.0, workers=None):
+    """Play one interactive game."""
+    # Initialize an empty board (the bitboard engine for classic 3x3)
+    board = new_board(rows, cols, k)
     
     print("Welcome to Tic Tac Toe!")
-    print("Players take turns entering moves as row,column coordinates (0-2).")
-    print("For example, the top-left corner is '0,0' and the bottom-right is '2,2'.")
+    if rows == cols:
+        print(f"Players take turns entering moves as row,column coordinates (0-{rows - 1}).")
+    else:
+        print(f"Players take turns entering moves as row,column coordinates (rows 0-{rows - 1}, columns 0-{cols - 1}).")
+    print(f"For example, the top-left corner is '0,0' and the bottom-right is '{rows - 1},{cols - 1}'.")
+    if k != SIZE:
+        print(f"Get {k} in a row to win.")
+    
+    # Single-player mode: the computer takes the other side
+    computer = None
+    if input("Play against the computer? (y/n): ").lower() == 'y':
+        computer = 'X' if input("Do you want to go first? (y/n): ").lower() == 'n' else 'O'
+        if isinstance(board, Board):
+            get_solver()
+        else:
+            get_mcts_player(think_time, workers)
     
     while True:
-        print_board(board)
-        print(f"Player {current_player}'s turn")
+        print_board(board.to_rows())
+        print(f"Player {board.current}'s turn")
         
         # Get player move
-        while True:
+        while board.current != computer:
             try:
                 move = input("Enter your move (row,col): ")
                 row, col = map(int, move.split(','))
                 
                 # Validate move
-                if not (0 <= row <= 2 and 0 <= col <= 2):
-                    print("Invalid coordinates! Row and column must be between 0 and 2.")
+                if not (0 <= row < rows and 0 <= col < cols):
+                    if rows == cols:
+                        print(f"Invalid coordinates! Row and column must be between 0 and {rows - 1}.")
+                    else:
+                        print(f"Invalid coordinates! Row must be between 0 and {rows - 1} and column between 0 and {cols - 1}.")
                     continue
                 
-                if board[row][col]:
+                if not board.is_empty(board.cell_index(row, col)):
                     print("That position is already taken! Try again.")
                     continue
                 
@@ -68,29 +96,58 @@ def main():
             except (ValueError, IndexError):
                 print("Invalid input! Please enter coordinates as 'row,col' (e.g., '1,2').")
         
-        # Make move
-        board[row][col] = current_player
+        if board.current == computer and isinstance(board, Board):
+            row, col = divmod(solver.best_move(board), cols)
+            print(f"The computer plays {row},{col}")
+        elif board.current == computer:
+            row, col = divmod(mcts_player.choose_move(board), cols)
+            stats = mcts_player.last_stats
+            print(f"The computer plays {row},{col} "
+                  f"({stats['playouts']} playouts, {stats['playouts_per_sec']:.0f}/s on {stats['workers']} workers)")
+        
+        # Make move (this also passes the turn to the other player)
+        current_player = board.current
+        board.play(board.cell_index(row, col))
         
         # Check for win
-        if check_winner(board, current_player):
-            print_board(board)
+        if board.last_player_won():
+            print_board(board.to_rows())
             print(f"Player {current_player} wins!")
             break
         
         # Check for tie
-        if is_board_full(board):
-            print_board(board)
+        if board.is_full():
+            print_board(board.to_rows())
             print("It's a tie!")
             break
-        
-        # Switch players
-        current_player = 'O' if current_player == 'X' else 'X'
-    
-    play_again = input("Would you like to play again? (y/n): ")
-    if play_again.lower() == 'y':
-        main()
-    else:
-        print("Thanks for playing!")
+
+def main(rows=SIZE, cols=SIZE, k=SIZE, think_time=2.0, workers=None):
+    """Main game function: play games until the players stop."""
+    while True:
+        play_game(rows, cols, k, think_time, workers)
+        play_again = input("Would you like to play again? (y/n): ")
+        if play_again.lower() != 'y':
+            print("Thanks for playing!")
+            break
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Play Tic Tac Toe, or k in a row on a bigger board")
+    parser.add_argument("--rows", type=int, default=SIZE)
+    parser.add_argument("--cols", type=int, default=SIZE)
+    parser.add_argument("--k", type=int, default=SIZE, help="marks in a row needed to win")
+    parser.add_argument("--think-time", type=float, default=2.0, help="seconds per computer move on large boards")
+    parser.add_argument("--workers", type=int, help="search processes on large boards (default: all cores)")
+    args = parser.parse_args()
+    if args.think_time <= 0:
+        parser.error("--think-time must be positive")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        check_size(args.rows, args.cols, args.k)
+    except ValueError as error:
+        parser.error(str(error))
+    try:
+        main(args.rows, args.cols, args.k, args.think_time, args.workers)
+    finally:
+        if mcts_player is not None:
+            mcts_player.close()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Perfect-play Tic Tac Toe opponent.
+A negamax search with alpha-beta pruning and a transposition table keyed
+by the canonical position: the smallest encoding among the 8 rotations
+and reflections of the board, so symmetric positions are solved once.
+Every reachable position can be solved ahead of time into a book of best
+moves; with the book loaded, choosing a move is a dictionary lookup.
+
+Build the book with:
+    python tic_tac_toe_ai.py [--out tic_tac_toe_book.bin]
+"""
+
+import argparse
+import os
+import struct
+
+from tic_tac_toe_engine import CELLS, SIZE, Board
+
+BOOK_PATH = "tic_tac_toe_book.bin"
+BOOK_MAGIC = b"TTTB"
+BOOK_VERSION = 1
+BOOK_HEADER = struct.Struct("<4sBI")
+BOOK_RECORD = struct.Struct("<IbB")  # canonical key, value, best move in the canonical frame
+WIN_SCORE = CELLS + 1                # Faster wins score higher, slower losses lose less
+EXACT, LOWER, UPPER = 0, 1, 2
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)  # Center, corners, then edges
+
+def symmetry_permutations():
+    """The 8 rotations and reflections of the board as cell -> cell maps."""
+    permutations = []
+    for turns in range(4):
+        for mirrored in (False, True):
+            permutation = []
+            for cell in range(CELLS):
+                row, col = divmod(cell, SIZE)
+                if mirrored:
+                    col = SIZE - 1 - col
+                for _ in range(turns):
+                    row, col = col, SIZE - 1 - row
+                permutation.append(row * SIZE + col)
+            permutations.append(tuple(permutation))
+    return tuple(permutations)
+
+SYMMETRIES = symmetry_permutations()
+INVERSE_SYMMETRIES = tuple(tuple(permutation.index(cell) for cell in range(CELLS)) for permutation in SYMMETRIES)
+
+def transform_table(permutation):
+    table = []
+    for bits in range(1 << CELLS):
+        moved = 0
+        for cell in range(CELLS):
+            if (bits >> cell) & 1:
+                moved |= 1 << permutation[cell]
+        table.append(moved)
+    return tuple(table)
+
+# TRANSFORMS[symmetry][bits] is the bitboard moved by that symmetry
+TRANSFORMS = tuple(transform_table(permutation) for permutation in SYMMETRIES)
+
+def canonical(board):
+    """Return (key, symmetry) of the smallest symmetric image of the position."""
+    x_bits, o_bits = board.bits
+    best_key = None
+    best_symmetry = 0
+    for symmetry, table in enumerate(TRANSFORMS):
+        key = table[x_bits] << CELLS | table[o_bits]
+        if best_key is None or key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+def board_from_key(key):
+    return Board.from_bits(key >> CELLS, key & ((1 << CELLS) - 1))
+
+class Solver:
+    def __init__(self, book=None):
+        self.table = {}        # canonical key -> (value, bound)
+        self.book = book or {} # canonical key -> (value, best move in the canonical frame)
+
+    def negamax(self, board, alpha, beta):
+        """Value of the position for the player to move."""
+        if board.last_player_won():
+            return -(WIN_SCORE - len(board.moves))
+        if board.is_full():
+            return 0
+
+        key = canonical(board)[0]
+        entry = self.table.get(key)
+        if entry is not None:
+            value, bound = entry
+            if bound == EXACT:
+                return value
+            if bound == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha = alpha
+        best = -WIN_SCORE
+        occupied = board.occupied
+        for cell in MOVE_ORDER:
+            if (occupied >> cell) & 1:
+                continue
+            board.play(cell)
+            value = -self.negamax(board, -beta, -alpha)
+            board.undo()
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best <= original_alpha:
+            self.table[key] = (best, UPPER)
+        elif best >= beta:
+            self.table[key] = (best, LOWER)
+        else:
+            self.table[key] = (best, EXACT)
+        return best
+
+    def search(self, board):
+        """Return (value, best cell) for the player to move in a non-terminal position."""
+        best_value = -WIN_SCORE - 1
+        best_cell = None
+        alpha = -WIN_SCORE
+        occupied = board.occupied
+        for cell in MOVE_ORDER:
+            if (occupied >> cell) & 1:
+                continue
+            board.play(cell)
+            value = -self.negamax(board, -WIN_SCORE, -alpha)
+            board.undo()
+            if value > best_value:
+                best_value = value
+                best_cell = cell
+                alpha = max(alpha, value)
+        return best_value, best_cell
+
+    def best_move(self, board):
+        """Best cell for the player to move: a book lookup, searched and remembered on a miss."""
+        key, symmetry = canonical(board)
+        entry = self.book.get(key)
+        if entry is None:
+            entry = self.search(board_from_key(key))
+            self.book[key] = entry
+        return INVERSE_SYMMETRIES[symmetry][entry[1]]
+
+    def build_book(self):
+        """Solve every reachable non-terminal position."""
+        seen = set()
+        frontier = [Board()]
+        while frontier:
+            board = frontier.pop()
+            key = canonical(board)[0]
+            if key in seen or (board.moves and board.last_player_won()) or board.is_full():
+                continue
+            seen.add(key)
+            canonical_board = board_from_key(key)
+            self.book[key] = self.search(canonical_board)
+            for cell in canonical_board.legal_moves():
+                child = board_from_key(key)
+                child.play(cell)
+                frontier.append(child)
+        return self.book
+
+    def save(self, path=BOOK_PATH):
+        with open(path, "wb") as file:
+            file.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(self.book)))
+            for key in sorted(self.book):
+                value, cell = self.book[key]
+                file.write(BOOK_RECORD.pack(key, value, cell))
+
+    @classmethod
+    def load(cls, path=BOOK_PATH):
+        """Solver backed by the book at path, or by a freshly built one if there is none."""
+        if not os.path.exists(path):
+            solver = cls()
+            solver.build_book()
+            return solver
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, count = BOOK_HEADER.unpack_from(data)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} Tic Tac Toe book")
+        book = {}
+        for key, value, cell in BOOK_RECORD.iter_unpack(data[BOOK_HEADER.size:BOOK_HEADER.size + BOOK_RECORD.size * count]):
+            book[key] = (value, cell)
+        return cls(book)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve Tic Tac Toe and write the opening book")
+    parser.add_argument("--out", default=BOOK_PATH)
+    args = parser.parse_args()
+    solver = Solver()
+    book = solver.build_book()
+    solver.save(args.out)
+    print(f"Wrote {len(book)} positions to {args.out} (value of the empty board: {book[0][0]})")
+
+if __name__ == "__main__":
+    main()
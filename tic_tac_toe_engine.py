@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Bitboard engine for Tic Tac Toe.
+Each player's stones are a 9-bit integer (bit = row * 3 + col). Whether a
+set of stones contains a line is precomputed for all 512 bitboards, so win
+detection is a single table lookup, and moves are applied and undone in
+place for search.
+MNKBoard generalizes the rules to k in a row on any rows x cols board
+(e.g. 15x15 Gomoku) with a sparse board and win checks through the last
+move only. Both boards share the same interface; new_board picks one.
+"""
+
+SIZE = 3
+CELLS = SIZE * SIZE
+FULL = (1 << CELLS) - 1
+PLAYERS = ("X", "O")
+
+def line_mask(cells):
+    mask = 0
+    for row, col in cells:
+        mask |= 1 << (row * SIZE + col)
+    return mask
+
+# Rows, columns and both diagonals
+WIN_MASKS = tuple(
+    [line_mask((row, col) for col in range(SIZE)) for row in range(SIZE)]
+    + [line_mask((row, col) for row in range(SIZE)) for col in range(SIZE)]
+    + [line_mask((i, i) for i in range(SIZE)), line_mask((i, SIZE - 1 - i) for i in range(SIZE))]
+)
+
+# WINNING[bits] is 1 if the bitboard contains a complete line
+WINNING = bytes(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << CELLS))
+
+def cell_index(row, col):
+    return row * SIZE + col
+
+def bits_from_rows(rows, player):
+    """Bitboard of player's marks on a list-of-lists board."""
+    bits = 0
+    for row in range(SIZE):
+        for col in range(SIZE):
+            if rows[row][col] == player:
+                bits |= 1 << cell_index(row, col)
+    return bits
+
+class Board:
+    __slots__ = ("bits", "player", "moves")
+    rows = cols = k = SIZE
+
+    def __init__(self):
+        self.bits = [0, 0]  # Stones of X and O
+        self.player = 0     # Index of the player to move
+        self.moves = []     # Cells played, for undo
+
+    @classmethod
+    def from_bits(cls, x_bits, o_bits):
+        """Board with the given stones; X moves next unless X has one more stone."""
+        board = cls()
+        board.bits = [x_bits, o_bits]
+        board.moves = [cell for cell in range(CELLS) if ((x_bits | o_bits) >> cell) & 1]
+        board.player = len(board.moves) % 2
+        return board
+
+    def cell_index(self, row, col):
+        return row * SIZE + col
+
+    @property
+    def occupied(self):
+        return self.bits[0] | self.bits[1]
+
+    @property
+    def current(self):
+        return PLAYERS[self.player]
+
+    def is_empty(self, cell):
+        return not (self.occupied >> cell) & 1
+
+    def legal_moves(self):
+        free = ~self.occupied & FULL
+        return [cell for cell in range(CELLS) if (free >> cell) & 1]
+
+    def play(self, cell):
+        self.bits[self.player] |= 1 << cell
+        self.moves.append(cell)
+        self.player ^= 1
+
+    def undo(self):
+        cell = self.moves.pop()
+        self.player ^= 1
+        self.bits[self.player] &= ~(1 << cell)
+
+    def has_won(self, player):
+        return WINNING[self.bits[player]] == 1
+
+    def last_player_won(self):
+        """True if the move just played completed a line."""
+        return WINNING[self.bits[self.player ^ 1]] == 1
+
+    def winner(self):
+        for player in (0, 1):
+            if WINNING[self.bits[player]]:
+                return PLAYERS[player]
+        return None
+
+    def is_full(self):
+        return self.occupied == FULL
+
+    def cell(self, row, col):
+        bit = 1 << cell_index(row, col)
+        if self.bits[0] & bit:
+            return PLAYERS[0]
+        if self.bits[1] & bit:
+            return PLAYERS[1]
+        return ""
+
+    def to_rows(self):
+        return [[self.cell(row, col) for col in range(SIZE)] for row in range(SIZE)]
+
+# Generalized m,n,k games (k in a row on a rows x cols board)
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+def check_size(rows, cols, k):
+    """Raise ValueError unless k in a row fits on a rows x cols board."""
+    if rows < 1 or cols < 1 or not 1 <= k <= max(rows, cols):
+        raise ValueError(f"Invalid board: {rows}x{cols} with {k} in a row")
+
+class MNKBoard:
+    """Sparse board for any size: only occupied cells are stored and a win
+    is checked along the four lines through the last move, in O(k)."""
+    __slots__ = ("rows", "cols", "k", "stones", "player", "moves")
+
+    def __init__(self, rows=15, cols=15, k=5):
+        check_size(rows, cols, k)
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.stones = {}  # cell -> player index, occupied cells only
+        self.player = 0
+        self.moves = []
+
+    @property
+    def current(self):
+        return PLAYERS[self.player]
+
+    def cell_index(self, row, col):
+        return row * self.cols + col
+
+    def is_empty(self, cell):
+        return cell not in self.stones
+
+    def legal_moves(self):
+        return [cell for cell in range(self.rows * self.cols) if cell not in self.stones]
+
+    def play(self, cell):
+        self.stones[cell] = self.player
+        self.moves.append(cell)
+        self.player ^= 1
+
+    def undo(self):
+        del self.stones[self.moves.pop()]
+        self.player ^= 1
+
+    def run_length(self, row, col, d_row, d_col, player):
+        """Stones of player in a row starting next to (row, col) in one direction."""
+        count = 0
+        row += d_row
+        col += d_col
+        while (0 <= row < self.rows and 0 <= col < self.cols
+               and self.stones.get(row * self.cols + col) == player):
+            count += 1
+            if count >= self.k:
+                break
+            row += d_row
+            col += d_col
+        return count
+
+    def last_player_won(self):
+        """True if the move just played completed k in a row."""
+        if not self.moves:
+            return False
+        cell = self.moves[-1]
+        player = self.stones[cell]
+        row, col = divmod(cell, self.cols)
+        for d_row, d_col in DIRECTIONS:
+            if (1 + self.run_length(row, col, d_row, d_col, player)
+                    + self.run_length(row, col, -d_row, -d_col, player)) >= self.k:
+                return True
+        return False
+
+    def is_full(self):
+        return len(self.stones) == self.rows * self.cols
+
+    def cell(self, row, col):
+        player = self.stones.get(row * self.cols + col)
+        return "" if player is None else PLAYERS[player]
+
+    def to_rows(self):
+        return [[self.cell(row, col) for col in range(self.cols)] for row in range(self.rows)]
+
+def new_board(rows=SIZE, cols=SIZE, k=SIZE):
+    """Bitboard for classic 3x3 Tic Tac Toe, a sparse board for anything else."""
+    if (rows, cols, k) == (SIZE, SIZE, SIZE):
+        return Board()
+    return MNKBoard(rows, cols, k)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo tree search player for k-in-a-row games on any board.
+UCT selects moves in the tree and random playouts score the leaves. The
+search runs on a pool of worker processes with root parallelization: each
+worker grows its own tree from the current position with a different
+seed, and the visit and win counts of the root moves are summed before
+the most visited move is picked. On large boards the tree only considers
+empty cells near existing stones.
+
+Benchmark playouts/sec with:
+    python tic_tac_toe_mcts.py --rows 15 --cols 15 --k 5 --time 2
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+
+from tic_tac_toe_engine import new_board
+
+EXPLORATION = math.sqrt(2)
+NEARBY_DISTANCE = 2   # Tree moves on big boards stay this close to existing stones
+SMALL_BOARD_CELLS = 25
+
+class Node:
+    __slots__ = ("move", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, parent, untried):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried  # Moves not expanded yet
+        self.visits = 0
+        self.wins = 0.0         # From the view of the player who made move; draws count half
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+def candidate_moves(board):
+    """Moves the tree expands: every empty cell on small boards, cells near stones on big ones."""
+    if board.rows * board.cols <= SMALL_BOARD_CELLS:
+        return board.legal_moves()
+    if not board.moves:
+        return [board.cell_index(board.rows // 2, board.cols // 2)]
+    nearby = set()
+    for cell in board.moves:
+        row, col = divmod(cell, board.cols)
+        for near_row in range(max(0, row - NEARBY_DISTANCE), min(board.rows, row + NEARBY_DISTANCE + 1)):
+            for near_col in range(max(0, col - NEARBY_DISTANCE), min(board.cols, col + NEARBY_DISTANCE + 1)):
+                near = near_row * board.cols + near_col
+                if board.is_empty(near):
+                    nearby.add(near)
+    return sorted(nearby)
+
+def playout(board, rng):
+    """Play random moves to the end and undo them; return the winner's index or None."""
+    moves = board.legal_moves()
+    rng.shuffle(moves)
+    played = 0
+    winner = None
+    for cell in moves:
+        board.play(cell)
+        played += 1
+        if board.last_player_won():
+            winner = board.player ^ 1
+            break
+    for _ in range(played):
+        board.undo()
+    return winner
+
+def check_budget(iterations, time_limit):
+    """A search needs a positive iteration count, a positive time limit, or both."""
+    if iterations is not None and iterations < 1:
+        raise ValueError(f"MCTS iterations must be at least 1, got {iterations}")
+    if time_limit is not None and time_limit <= 0:
+        raise ValueError(f"MCTS time limit must be positive, got {time_limit}")
+    if iterations is None and time_limit is None:
+        raise ValueError("MCTS needs an iteration or time budget")
+
+def search(board, iterations=None, time_limit=None, exploration=EXPLORATION, seed=None):
+    """Grow a UCT tree from board; return ({move: (visits, wins)}, playouts).
+    At least one iteration runs however small the budget."""
+    check_budget(iterations, time_limit)
+    rng = random.Random(seed)
+    untried = candidate_moves(board)
+    rng.shuffle(untried)
+    root = Node(None, None, untried)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    playouts = 0
+
+    while playouts == 0 or ((iterations is None or playouts < iterations)
+                            and (deadline is None or time.perf_counter() < deadline)):
+        node = root
+        depth = 0
+
+        # Selection (terminal nodes have nothing to expand and no children)
+        while not node.untried and node.children:
+            node = node.select_child(exploration)
+            board.play(node.move)
+            depth += 1
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop()
+            board.play(move)
+            depth += 1
+            finished = board.last_player_won() or board.is_full()
+            untried = [] if finished else candidate_moves(board)
+            rng.shuffle(untried)
+            child = Node(move, node, untried)
+            node.children.append(child)
+            node = child
+
+        # Simulation
+        if board.moves and board.last_player_won():
+            winner = board.player ^ 1
+        elif board.is_full():
+            winner = None
+        else:
+            winner = playout(board, rng)
+        playouts += 1
+
+        # Backpropagation: node.move was made by the player before the one to move
+        mover = board.player ^ 1
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == mover:
+                node.wins += 1
+            node = node.parent
+            mover ^= 1
+        for _ in range(depth):
+            board.undo()
+
+    return {child.move: (child.visits, child.wins) for child in root.children}, playouts
+
+def search_worker(task):
+    rows, cols, k, moves, iterations, time_limit, exploration, seed = task
+    board = new_board(rows, cols, k)
+    for cell in moves:
+        board.play(cell)
+    return search(board, iterations, time_limit, exploration, seed)
+
+class MCTSPlayer:
+    def __init__(self, time_limit=1.0, iterations=None, workers=None, exploration=EXPLORATION, seed=None):
+        check_budget(iterations, time_limit)
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.pool = None  # Started on the first parallel search
+        self.last_stats = {}
+
+    def choose_move(self, board):
+        """Most visited root move over all workers' trees."""
+        start = time.perf_counter()
+        if self.workers == 1:
+            results = [search(board, self.iterations, self.time_limit, self.exploration, self.rng.random())]
+        else:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.workers)
+            iterations = -(-self.iterations // self.workers) if self.iterations else None
+            tasks = [(board.rows, board.cols, board.k, list(board.moves), iterations, self.time_limit,
+                      self.exploration, self.rng.random()) for _ in range(self.workers)]
+            results = self.pool.map(search_worker, tasks)
+        elapsed = time.perf_counter() - start
+
+        # Merge the root statistics of every tree
+        merged = {}
+        playouts = 0
+        for stats, count in results:
+            playouts += count
+            for move, (visits, wins) in stats.items():
+                total_visits, total_wins = merged.get(move, (0, 0.0))
+                merged[move] = (total_visits + visits, total_wins + wins)
+        if merged:
+            move = max(merged, key=lambda move: merged[move][0])
+            visits, wins = merged[move]
+        else:
+            # Nothing was expanded (e.g. the position is already decided): any legal move will do
+            move = self.rng.choice(board.legal_moves())
+            visits, wins = 0, 0.0
+        self.last_stats = {
+            "playouts": playouts,
+            "seconds": elapsed,
+            "playouts_per_sec": playouts / elapsed if elapsed else 0.0,
+            "workers": self.workers,
+            "win_rate": wins / visits if visits else 0.0,
+        }
+        return move
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MCTS playouts/sec on an m,n,k board")
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--cols", type=int, default=15)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--time", type=float, default=2.0, help="seconds per move")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--moves", type=int, default=1, help="moves to play from the empty board")
+    args = parser.parse_args()
+    if args.time <= 0:
+        parser.error("--time must be positive")
+
+    board = new_board(args.rows, args.cols, args.k)
+    player = MCTSPlayer(args.time, workers=args.workers)
+    try:
+        for _ in range(args.moves):
+            move = player.choose_move(board)
+            board.play(move)
+            stats = player.last_stats
+            row, col = divmod(move, args.cols)
+            print(f"Move {len(board.moves)} at {row},{col}: "
+                  f"{stats['playouts']} playouts in {stats['seconds']:.2f} s, "
+                  f"{stats['playouts_per_sec']:.0f}/s on {stats['workers']} workers, win rate {stats['win_rate']:.2f}")
+            if board.last_player_won() or board.is_full():
+                break
+    finally:
+        player.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Batch self-play and tournaments for the Tic Tac Toe bots.
+Two player specs play N games on a process pool without any input().
+Every game is written as one JSON line (players, result, move list and
+per-move think time) as soon as its batch finishes, and a win/draw/loss
+summary is printed at the end.
+
+Player specs:
+    random                      uniformly random legal moves
+    solver                      perfect play from the solved book (3x3 only)
+    mcts[:time=0.1,iterations=500,exploration=1.4]
+    script:1,1;0,0;2,2          scripted "row,col" inputs like a human would type;
+                                taken cells are skipped and random moves follow the script
+
+    python tic_tac_toe_tournament.py --x mcts:iterations=300 --o solver --games 10000 --out results.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from tic_tac_toe_ai import BOOK_PATH, Solver
+from tic_tac_toe_engine import SIZE, Board, check_size, new_board
+from tic_tac_toe_mcts import EXPLORATION, MCTSPlayer
+
+class RandomPlayer:
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose_move(self, board):
+        return self.rng.choice(board.legal_moves())
+
+class SolverPlayer:
+    def __init__(self, solver):
+        self.solver = solver
+
+    def choose_move(self, board):
+        if not isinstance(board, Board):
+            raise ValueError("The solver only plays classic 3x3 Tic Tac Toe")
+        return self.solver.best_move(board)
+
+class ScriptedPlayer:
+    def __init__(self, inputs, rng):
+        self.inputs = inputs
+        self.rng = rng
+        self.position = 0
+
+    def choose_move(self, board):
+        while self.position < len(self.inputs):
+            text = self.inputs[self.position]
+            self.position += 1
+            try:
+                row, col = map(int, text.split(","))
+            except ValueError:
+                continue
+            if 0 <= row < board.rows and 0 <= col < board.cols and board.is_empty(board.cell_index(row, col)):
+                return board.cell_index(row, col)
+        return self.rng.choice(board.legal_moves())
+
+# Per-process state: the solved book is loaded once per worker
+solver = None
+
+def make_player(spec, rng):
+    global solver
+    name, _, options = spec.partition(":")
+    if name == "script":
+        return ScriptedPlayer(options.split(";") if options else [], rng)
+    settings = {}
+    for option in options.split(","):
+        key, equals, value = option.partition("=")
+        if option and not equals:
+            raise ValueError(f"Bad option {option!r} in player {spec!r}, expected key=value")
+        if option:
+            settings[key] = value
+    if name == "random":
+        return RandomPlayer(rng)
+    if name == "solver":
+        if solver is None:
+            solver = Solver.load(BOOK_PATH)
+        return SolverPlayer(solver)
+    if name == "mcts":
+        unknown = set(settings) - {"time", "iterations", "exploration"}
+        if unknown:
+            raise ValueError(f"Unknown MCTS options {sorted(unknown)} in player {spec!r}")
+        iterations = int(settings["iterations"]) if "iterations" in settings else None
+        if "time" in settings:
+            time_limit = float(settings["time"])
+        else:
+            time_limit = None if iterations else 0.1
+        return MCTSPlayer(time_limit, iterations, workers=1,
+                          exploration=float(settings.get("exploration", EXPLORATION)),
+                          seed=rng.random())
+    raise ValueError(f"Unknown player {spec!r}")
+
+def check_tournament(x_spec, o_spec, games, rows, cols, k, workers, batch_size):
+    """Raise ValueError for settings that would only fail inside the workers."""
+    if games < 0:
+        raise ValueError("The number of games cannot be negative")
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least 1")
+    if workers is not None and workers < 1:
+        raise ValueError("The number of workers must be at least 1")
+    check_size(rows, cols, k)
+    for spec in (x_spec, o_spec):
+        player = make_player(spec, random.Random())
+        if isinstance(player, SolverPlayer) and (rows, cols, k) != (SIZE, SIZE, SIZE):
+            raise ValueError(f"{spec!r} only plays classic {SIZE}x{SIZE} Tic Tac Toe")
+
+def play_game(index, x_spec, o_spec, rows, cols, k, seed):
+    """Play one game; return its result record."""
+    rng = random.Random(f"{seed}:{index}")
+    players = (make_player(x_spec, rng), make_player(o_spec, rng))
+    board = new_board(rows, cols, k)
+    think_ms = []
+    winner = None
+    while True:
+        player = players[board.player]
+        start = time.perf_counter()
+        cell = player.choose_move(board)
+        think_ms.append(round((time.perf_counter() - start) * 1000, 4))
+        if not board.is_empty(cell):
+            raise ValueError(f"{(x_spec, o_spec)[board.player]} played the taken cell {cell}")
+        board.play(cell)
+        if board.last_player_won():
+            winner = board.player ^ 1
+            break
+        if board.is_full():
+            break
+    return {
+        "game": index,
+        "X": x_spec,
+        "O": o_spec,
+        "winner": None if winner is None else "XO"[winner],
+        "moves": len(board.moves),
+        "move_list": board.moves,
+        "think_ms": think_ms,
+    }
+
+def play_batch(task):
+    """Play a range of games in a worker; return their JSON lines and the tally."""
+    first, count, x_spec, o_spec, swap, rows, cols, k, seed = task
+    lines = []
+    tally = {}
+    for index in range(first, first + count):
+        x, o = (o_spec, x_spec) if swap and index % 2 else (x_spec, o_spec)
+        result = play_game(index, x, o, rows, cols, k, seed)
+        lines.append(json.dumps(result, separators=(",", ":")))
+        record_result(tally, result)
+    return "\n".join(lines) + "\n", tally
+
+def record_result(tally, result):
+    """Count wins, draws and losses per (player spec, side) and think time per spec."""
+    for side in ("X", "O"):
+        stats = tally.setdefault((result[side], side), {"games": 0, "win": 0, "draw": 0, "loss": 0,
+                                                        "moves": 0, "think_ms": 0.0})
+        stats["games"] += 1
+        if result["winner"] is None:
+            stats["draw"] += 1
+        elif result["winner"] == side:
+            stats["win"] += 1
+        else:
+            stats["loss"] += 1
+        own_moves = result["think_ms"][0 if side == "X" else 1::2]
+        stats["moves"] += len(own_moves)
+        stats["think_ms"] += sum(own_moves)
+
+def merge_tally(total, tally):
+    for key, stats in tally.items():
+        merged = total.setdefault(key, dict.fromkeys(stats, 0))
+        for name, value in stats.items():
+            merged[name] += value
+
+def run_tournament(x_spec, o_spec, games, out, rows=SIZE, cols=SIZE, k=SIZE,
+                   workers=None, batch_size=1000, swap=False, seed=0):
+    """Play games on a process pool, streaming JSON lines to out; return the tally."""
+    check_tournament(x_spec, o_spec, games, rows, cols, k, workers, batch_size)
+    tasks = [(first, min(batch_size, games - first), x_spec, o_spec, swap, rows, cols, k, seed)
+             for first in range(0, games, batch_size)]
+    total = {}
+    done = 0
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers or os.cpu_count() or 1) as pool:
+        for lines, tally in pool.imap_unordered(play_batch, tasks):
+            out.write(lines)
+            out.flush()
+            merge_tally(total, tally)
+            done += lines.count("\n")
+            elapsed = time.perf_counter() - start
+            print(f"\r{done}/{games} games, {done / elapsed:.0f} games/s", end="", flush=True)
+    print()
+    return total
+
+def print_summary(tally):
+    for (spec, side), stats in sorted(tally.items()):
+        games = stats["games"]
+        print(f"{spec} as {side}: {games} games, {stats['win']} wins ({stats['win'] / games:.1%}), "
+              f"{stats['draw']} draws, {stats['loss']} losses, "
+              f"{stats['think_ms'] / max(1, stats['moves']):.3f} ms/move")
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Tic Tac Toe bots against each other in batch")
+    parser.add_argument("--x", default="random", help="player spec for X")
+    parser.add_argument("--o", default="solver", help="player spec for O")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--swap", action="store_true", help="alternate sides every game")
+    parser.add_argument("--rows", type=int, default=SIZE)
+    parser.add_argument("--cols", type=int, default=SIZE)
+    parser.add_argument("--k", type=int, default=SIZE)
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="games per task sent to a worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="tournament.jsonl", help="JSONL results file")
+    args = parser.parse_args()
+    try:
+        check_tournament(args.x, args.o, args.games, args.rows, args.cols, args.k, args.workers, args.batch_size)
+    except ValueError as error:
+        parser.error(str(error))
+
+    with open(args.out, "w", encoding="utf-8") as out:
+        tally = run_tournament(args.x, args.o, args.games, out, args.rows, args.cols, args.k,
+                               args.workers, args.batch_size, args.swap, args.seed)
+    print_summary(tally)
+
+if __name__ == "__main__":
+    main()